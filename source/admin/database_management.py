@@ -1,69 +1,117 @@
-'''This module contains administrator functions for database management.'''
- 
-# Copyright 2014 Boris Dayma
-# 
-# This file is part of GridCompute.
-# 
-# GridCompute is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, version 3 of the License.
-# 
-# GridCompute is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-# 
-# You should have received a copy of the GNU General Public License
-# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
-#
-# For any question, please contact Boris Dayma at boris.dayma@gmail.com
-
-
-import pymongo
-
-
-def set_up_mongodb_server(mongodb_server, login, password, versions):
-    '''Sets up a mongodb server for GridCompute.
-
-    Mongo database "gridcompute" is initialized and the "versions" collection is created to specify
-    the program versions that are authorized by the database.
-
-    The "gridcompute" database must be present on the server. Any collection in it will be removed.
-
-    Args:
-        mongodb_server: Address of the mongo instance including connection port containing
-                      *gridcompute* database like ``mongodbserver.com:888`` or ``10.0.0.1:888``
-                      or ``Machine123:888``
-        login: Login used to connect on mongo database.
-        password: Password used to connect on mongo database.
-        versions: List of versions of gridcompute that the mongo database recognizes defined by:
-
-                  - _id: version number (ex: '0.1').
-                  - status: either "allowed", "warning" or "refused".
-                  - message: message to be displayed when status is not "allowed" like::
-                   
-                      [{'_id':'0.1', status:"warning", message:"Beta version},
-                       {'_id':'1.0', status:"allowed"}]
-
-    '''
-
-    # create new connection
-    mongodb = pymongo.MongoClient('{}'.format(mongodb_server)).gridcompute
-    mongodb.authenticate(login, password)
-
-    # drop all previous collections
-    for collection in mongodb.collection_names(False):
-        mongodb.drop_collection(collection)
-
-    # create "versions" collection and populate it
-    mongodb['versions'].insert(versions)
-
-if __name__ == "__main__":
-
-    # Define variables of mongodb server
-    mongodb_server = 'localhost:27017'
-    login, password = 'default_grid', 'gridcompute'
-    versions = [{'_id':'0.2', 'status':'warning', 'message':'This is a beta version used for test purposes only'}]
-
-    # Set up MongoDB server
-    set_up_mongodb_server(mongodb_server, login, password, versions)
+'''This module contains administrator functions for database management.'''
+ 
+# Copyright 2014 Boris Dayma
+# 
+# This file is part of GridCompute.
+# 
+# GridCompute is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+# 
+# GridCompute is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For any question, please contact Boris Dayma at boris.dayma@gmail.com
+
+
+import atexit
+import functools
+
+import pymongo
+
+import g_config as config
+
+
+insert_batch_size = 100  # maximal number of documents sent per insert request
+
+
+@functools.lru_cache(maxsize=16)
+def get_client(mongodb_server, login, password):
+    '''Return a client connected to a mongodb server.
+
+    Clients are cached so that successive calls with same parameters reuse the same connection pool.
+
+    Args:
+        mongodb_server: Address of the mongo instance including connection port.
+        login: Login used to connect on mongo database.
+        password: Password used to connect on mongo database.'''
+
+    client = pymongo.MongoClient(mongodb_server, username=login, password=password, authSource='gridcompute',
+                                 maxPoolSize=config.mongo_max_pool_size, minPoolSize=config.mongo_min_pool_size,
+                                 maxIdleTimeMS=config.mongo_max_idle_ms)
+    atexit.register(client.close)
+    return client
+
+def seed_collection(collection, documents):
+    '''Insert documents in a collection through unordered bulk writes.
+
+    Args:
+        collection: Collection to populate.
+        documents: List of documents to insert.'''
+
+    for start in range(0, len(documents), insert_batch_size):
+        collection.bulk_write([pymongo.InsertOne(document) for document in documents[start:start + insert_batch_size]],
+                              ordered=False)
+
+def set_up_mongodb_server(mongodb_server, login, password, versions):
+    '''Sets up a mongodb server for GridCompute.
+
+    Mongo database "gridcompute" is initialized and the "versions" collection is created to specify
+    the program versions that are authorized by the database. The "cases" collection is created with
+    the indexes used to list and claim cases, and the "case_events" capped collection notifies daemons of new cases.
+
+    The "gridcompute" database must be present on the server. All its collections and data are removed,
+    which only requires the "readWrite" role on it.
+
+    Args:
+        mongodb_server: Address of the mongo instance including connection port containing
+                      *gridcompute* database like ``mongodbserver.com:888`` or ``10.0.0.1:888``
+                      or ``Machine123:888``
+        login: Login used to connect on mongo database.
+        password: Password used to connect on mongo database.
+        versions: List of versions of gridcompute that the mongo database recognizes defined by:
+
+                  - _id: version number (ex: '0.1').
+                  - status: either "allowed", "warning" or "refused".
+                  - message: message to be displayed when status is not "allowed" like::
+                   
+                      [{'_id':'0.1', status:"warning", message:"Beta version},
+                       {'_id':'1.0', status:"allowed"}]
+
+    '''
+
+    # get connection
+    client = get_client(mongodb_server, login, password)
+
+    # drop all previous data, collection by collection since dropping the database requires more privileges
+    mongodb = client.gridcompute
+    for collection in mongodb.list_collection_names():
+        if not collection.startswith('system.'):
+            mongodb.drop_collection(collection)
+
+    # create "versions" collection and populate it by batches
+    mongodb.create_collection('versions')
+    seed_collection(mongodb['versions'], versions)
+
+    # create "cases" collection with indexes matching queries on cases
+    mongodb.create_collection('cases')
+    mongodb['cases'].create_indexes([pymongo.IndexModel(keys) for keys in config.db_cases_indexes])
+
+    # create "case_events" capped collection tailed by daemons, never empty so that cursors stay open
+    mongodb.create_collection('case_events', capped=True, size=config.db_case_events_size)
+    mongodb['case_events'].insert_one({'kind':'created'})
+
+if __name__ == "__main__":
+
+    # Define variables of mongodb server
+    mongodb_server = 'localhost:27017'
+    login, password = 'default_grid', 'gridcompute'
+    versions = [{'_id':'0.2', 'status':'warning', 'message':'This is a beta version used for test purposes only'}]
+
+    # Set up MongoDB server
+    set_up_mongodb_server(mongodb_server, login, password, versions)
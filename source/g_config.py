@@ -9,15 +9,41 @@ Attributes:
           copyright: Copyright.
           title_windows: Title displayed on windows.
           max_number_process: Maximal number of parallel process that can be executed on this computer.
-          gui_refresh_interval: Refresh rate of interface in milliseconds.
+          gui_refresh_interval: Maximal refresh interval of interface in milliseconds when polling events.
+          gui_refresh_min_interval: Minimal refresh interval of interface in milliseconds when polling events.
+          gui_log_max_lines: Maximal number of lines kept in the log displayed in interface.
+          gui_progress_interval: Minimal time in seconds between two updates of progress window.
           db_connect_frequency: Time in seconds before database is accessed again if no case/result is found.
           db_heartbeat_frequency: Frequency in seconds that heartbeat are sent on running processes to notify
                                 database that they are still alive.
           db_heatbeat_dead: Time in seconds without heartbeat after which we consider a process is dead.
           daemon_pause: Time in seconds between each process of daemons.
+          db_insert_batch_size: Maximal number of cases inserted on database in a single request.
+          db_batch_size: Number of cases returned by database in each batch when listing cases.
+          db_case_events_size: Size in bytes of the capped collection notifying daemons of new cases.
+          db_cases_indexes: Keys of indexes of "cases" collection, used to list cases to process or of a user group,
+                          and to claim new cases or cases abandoned by their processor.
+          file_buffer_size: Size in bytes of buffers used to read and write local files.
+          network_buffer_size: Size in bytes of chunks used to copy files to or from file server.
+          zip_compress_level: Compression level (0 to 9) of zip archives of cases.
+          incompressible_extensions: Extensions of already compressed files, stored without compression in zip archives.
+          zip_sample_size: Size in bytes of the beginning of a file compressed to check whether it is compressible.
+          zip_incompressible_ratio: Compression ratio of the sample above which a file is stored without compression.
+          zip_memory_size: Size in bytes up to which a zip archive is kept in memory before being copied to
+                         file server.
+          zip_max_pending: Maximal number of zip archives of cases being created or waiting to be copied to
+                         file server.
+          mongo_max_pool_size: Maximal number of connections kept by each mongo client.
+          mongo_min_pool_size: Minimal number of connections kept open by each mongo client.
+          mongo_max_idle_ms: Time in milliseconds after which an idle connection is closed.
+          mongo_server_selection_timeout_ms: Time in milliseconds after which an operation fails if mongo
+                                           server cannot be reached.
+          machine_name: Name of this computer on the network.
+          user_name: Login name of current user.
           log_path: Path of the log file.
           pid_file: Path of the file keeping pid of the program to ensure there is only one single instance
                   running.
+          bytecode_cache_folder: Local folder of current user where compiled app-specific scripts are cached.
           '''
 
 # Copyright 2014 Boris Dayma
@@ -39,11 +65,23 @@ Attributes:
 # For any question, please contact Boris Dayma at boris.dayma@gmail.com
 
 
-import multiprocessing
+import getpass
+import os
 import pathlib
+import platform
+import sys
 import tempfile
 
 
+__all__ = ['program_name', 'version', 'author', 'copyright',
+           'title_windows', 'max_number_process', 'gui_refresh_interval', 'gui_refresh_min_interval', 'gui_log_max_lines', 'gui_progress_interval',
+           'db_connect_frequency', 'db_heartbeat_frequency', 'db_heartbeat_dead', 'daemon_pause', 'db_insert_batch_size', 'db_batch_size', 'db_case_events_size', 'db_cases_indexes',
+           'file_buffer_size', 'network_buffer_size', 'zip_compress_level', 'incompressible_extensions', 'zip_sample_size', 'zip_incompressible_ratio',
+           'zip_memory_size', 'zip_max_pending',
+           'mongo_max_pool_size', 'mongo_min_pool_size', 'mongo_max_idle_ms', 'mongo_server_selection_timeout_ms',
+           'machine_name', 'user_name', 'log_path', 'pid_file', 'bytecode_cache_folder']
+
+
 # Program variables
 
 program_name = "Gridcompute"
@@ -54,9 +92,11 @@ copyright = "Copyright 2014 Boris Dayma"
 
 # GUI variables
 
-title_windows = "{} v{}".format(program_name, version)
-max_number_process = multiprocessing.cpu_count()
+title_windows = program_name + " v" + version
 gui_refresh_interval = 500
+gui_refresh_min_interval = 10
+gui_log_max_lines = 2000
+gui_progress_interval = 0.1
 
 
 # Server variables
@@ -65,9 +105,45 @@ db_connect_frequency = 30
 db_heartbeat_frequency = 60
 db_heartbeat_dead = 60 + db_heartbeat_frequency
 daemon_pause = 2
-
-
-# Log variables
-
-log_path = pathlib.Path(tempfile.gettempdir()) / 'GridCompute' / 'gridcompute.log'
-pid_file = pathlib.Path(tempfile.gettempdir()) / 'GridCompute' / 'pid'
+db_insert_batch_size = 100
+db_batch_size = 500
+db_case_events_size = 1 << 20
+db_cases_indexes = [[('user_group', 1), ('instance', 1), ('status', 1), ('_id', 1)],
+                    [('user_group', 1), ('_id', 1)],
+                    [('user_group', 1), ('instance', 1), ('status', 1), ('application', 1), ('_id', 1)],
+                    [('user_group', 1), ('instance', 1), ('status', 1), ('last_heartbeat', 1)]]  # ascending keys
+file_buffer_size = 1 << 20
+network_buffer_size = 1 << 22
+zip_memory_size = 1 << 24
+zip_max_pending = 8
+zip_compress_level = 1
+incompressible_extensions = frozenset(('.zip', '.gz', '.bz2', '.xz', '.7z', '.rar',
+                                       '.jpg', '.jpeg', '.png', '.mp3', '.mp4', '.h5', '.parquet'))
+zip_sample_size = 1 << 16
+zip_incompressible_ratio = 0.95
+mongo_max_pool_size = 50
+mongo_min_pool_size = 1
+mongo_max_idle_ms = 300000
+mongo_server_selection_timeout_ms = 5000
+
+
+# Variables evaluated only when first accessed
+
+_module = sys.modules[__name__]
+_lazy_variables = {
+        'max_number_process': lambda: os.cpu_count() or 1,
+        'machine_name': lambda: platform.node(),
+        'user_name': lambda: getpass.getuser(),
+        '_temp_folder': lambda: pathlib.Path(tempfile.gettempdir()) / 'GridCompute',
+        'log_path': lambda: _module._temp_folder / 'gridcompute.log',
+        'pid_file': lambda: _module._temp_folder / 'pid',
+        'bytecode_cache_folder': lambda: _module._temp_folder / 'pycache-{}'.format(_module.user_name)}
+
+def __getattr__(name):
+    '''Evaluate a lazy variable on its first access and keep it as a regular module variable.'''
+
+    if name not in _lazy_variables:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = _lazy_variables[name]()
+    globals()[name] = value
+    return value
@@ -1,914 +1,1399 @@
-'''This module contains all server related functionalities.
- 
-It creates server variables associated to file server and mongo database
-and handle the communication with them.'''
-
-# Copyright 2014 Boris Dayma
-# 
-# This file is part of GridCompute.
-# 
-# GridCompute is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, version 3 of the License.
-# 
-# GridCompute is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-# 
-# You should have received a copy of the GNU General Public License
-# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
-#
-# For any question, please contact Boris Dayma at boris.dayma@gmail.com
-
-
-import csv
-import datetime
-import getpass
-import importlib
-import multiprocessing
-import os
-import pathlib
-import platform
-import shutil
-import sys
-import tempfile
-import time
-import zipfile, zlib
-
-import bson
-import psutil
-import pymongo
-
-import g_config as config
-
-
-class Server:
-    '''Class handling server-related functionalities.
-
-    File server path is taken from "server.txt" present at root of program.  Settings are taken from
-    "settings.txt" present on the file server.
-    
-    Server properties are set at initialization.
-
-    Args:
-        event_queue: queue of events to process by gui
-        gui_dedicated_process: number of dedicated process selected in gui
-        daemon_dedicated_process: number of dedicated process communicated to daemon process
-        exit_program: variable scanned by daemons to know when to exit
-        gui_answer: notify when gui answered a question
-        server_path: path of file server as defined in "server.txt" file
-        app_path: path of applications-specific scripts
-        settings_path: path of settings.txt file
-        settings: list of settings from settings.txt on file server including:
-
-                  - mongodb server: Address of the mongo instance including connection port containing
-                    "gridcompute" like ``mongodbserver.com:888`` or ``10.0.0.1:888`` or ``Machine123:888``.
-                  - user group: Login used to connect on mongo database.
-                  - password: Password used to connect on mongo database.
-                  - instance: Data instance to consider like ``0`` or ``debug``.
-
-        mongodb: Connection to mongo database
-        server_functions: Dictionary of application-specific scripts. The key is application name and value is
-                        a dictionary of following keys:
-
-                        - path: path of application folder
-                        - send, process, receive: booleans corresponding to existence of these functions
-
-        software_allowed_to_run: set of applications that can run as defined in "Software_Per_Machine.csv"
-    '''
-
-    def __init__(self, event_queue, dedicated_process):
-        
-        self.event_queue = event_queue
-        self.gui_dedicated_process = dedicated_process
-        self.gui_dedicated_process.trace('w', self.notify_number_process_daemon)
-        self.daemon_dedicated_process = multiprocessing.Value('i', 0)
-        self.exit_program = multiprocessing.Event()
-        self.exit_program.clear()
-        self.gui_answer = multiprocessing.Event()
-
-        server_file = pathlib.Path("server.txt")
-        if not server_file.is_file():
-            self.event_queue.put({'type':'critical', 'message':'File server.txt not found in current directory'})
-            raise SystemExit
-        with server_file.open() as f:
-            server_path_name = f.read().strip()
-        self.server_path = pathlib.Path(server_path_name)
-        if not self.server_path.is_dir():
-            self.event_queue.put({'type':'critical', 'message':'File server.txt does not define an accessible directory'})
-            raise SystemExit
-        settings_folder = self.server_path / "Settings"
-        if not settings_folder.is_dir():
-            self.event_queue.put({'type':'critical', 'message':'Settings folder not found at\n{}'.format(str(settings_folder))})
-            raise SystemExit
-
-        self.app_path = self.server_path / "Settings" / "Applications"
-        self.settings_path = self.server_path / "Settings" / "settings.txt"
-        sys.path.insert(0, str(self.app_path))  # allow to load app-specific scripts easily
-        self.settings = self.get_settings()
-        self.mongodb = self.access_mongodb()
-        self.handle_software_permissions()
-        self.server_functions = self.scan_applications()
-        self.software_allowed_to_run = self.get_software_allowed_to_run()
-        self.event_queue.put({'type':'info', 'message':'Logged on grid "{}" instance "{}"'.format(self.settings['user group'], self.settings['instance'])})
-
-        self.create_daemons()  # daemons can start
-
-    def notify_number_process_daemon(self, *args):
-        '''Notify the daemon process of a change of number of processes selected in GUI.'''
-
-        self.daemon_dedicated_process.value = int(self.gui_dedicated_process.get())
-
-    def get_settings(self):
-        '''Initialize settings variable from "settings.txt" present on server.'''
-
-        if not self.settings_path.is_file():
-            self.event_queue.put({'type':'critical', 'message':'File settings.txt not found in Settings directory'})
-            raise SystemExit
-        with self.settings_path.open() as f:
-            settings = {value[0].strip():value[-1].strip() for value in
-                    (line.split(":", 1) for line in f.read().strip().split('\n'))}
-
-        required_settings = {'mongodb server', 'instance', 'user group', 'password'}
-        if not all(k in settings for k in required_settings):
-            missing_settings = required_settings - settings.keys()
-            self.event_queue.put({'type':'critical', 
-                                 'message':'"settings.txt" missing data:\n{}'.format(
-                                     '\n'.join('"{}"'.format(x) for x in missing_settings))})
-            raise SystemExit
-        self.event_queue.put({'type':'info', 'message':'Accessed "settings.txt" properties'})
-        return settings
-
-    def access_mongodb(self):
-        '''Access the mongo database.'''
-
-        try:
-            mongodb = pymongo.MongoClient("{}".format(self.settings['mongodb server'])).gridcompute
-        except:
-            self.event_queue.put({'type':'critical',
-                                 'message':'Database currently not accessible.\nPlease check your connection and "mongodb server" setting.'})
-            raise SystemExit
-        try:
-            mongodb.authenticate(self.settings['user group'], self.settings['password'])
-        except:
-            self.event_queue.put({'type':'critical',
-                                 'message':'You are not authorized to use this software.\nPlease check "user group" and "password" settings.'})
-            raise SystemExit
-        self.event_queue.put({'type':'info', 'message':'Accessed mongo database'})
-        return mongodb
-
-    def handle_software_permissions(self):
-        '''Verify that mongo database allows current version of program to run.
-        
-        This is based on the collection "versions" present in mongo database.
-        If "versions" collection is not present, a warning is displayed.'''
-
-        if 'versions' not in self.mongodb.collection_names():
-            self.event_queue.put({'type':'warning',
-                                'message':'Mongo database does not contain a "versions" collection.\nData may be corrupted and program unstable.'})
-
-        version = self.mongodb.versions.find_one({'_id':str(config.version)})
-        if version is None:
-            self.event_queue.put({'type':'critical', 'message':'Error: Version {} is not valid'.format(config.version)})
-            raise SystemExit
-        elif version['status'] == 'warning':
-            self.event_queue.put({'type':'warning', 'message':version['message']})
-        elif access['status'] == 'refused':
-            self.event_queue.put({'type':'critical', 'message':version['message']})
-            raise SystemExit
-        else:
-            self.event_queue.put({'type':'info', 'message':'Current version of program is valid'})
-
-    def scan_applications(self):
-        '''Scan application specific scripts present on file server.'''
-
-        application_folders = (folder for folder in self.app_path.glob("*") if folder.is_dir())
-        applications = ({folder.name : {"path" : folder, "send" : (folder / "send.py").is_file(),
-                                        "process" : (folder / "process.py").is_file(),
-                                        "receive" : (folder / "receive.py").is_file()}
-                        for folder in application_folders})
-        self.event_queue.put({'type':'info', 'message':'Scanned application specific scripts'})
-        return applications
-
-    def applications_with_send(self):
-        '''Return a dictionary of applications that have a send function.
-
-        The key is the application name and the value is the script path.'''
-
-        return {app : (self.server_functions[app]["path"] / "send.py") for app in self.server_functions if self.server_functions[app]["send"]}
-
-    def applications_with_process(self):
-        '''Return a dictionary of applications that have a process function.
-
-        The key is the application name and the value is the script path.'''
-
-        return {app : (self.server_functions[app]["path"] / "process.py") for app in self.server_functions if self.server_functions[app]["process"]}
-
-    def applications_with_receive(self):
-        '''Return a dictionary of applications that have a receive function.
-
-        The key is the application name and the value is the script path.'''
-
-        return {app : (self.server_functions[app]["path"] / "receive.py") for app in self.server_functions if self.server_functions[app]["receive"]}
-
-    def get_software_allowed_to_run(self):
-        '''Return the list of software allowed to run on this machine per "Software_Per_Machine.csv"
-        present on file server.'''
-
-        self.event_queue.put({'type':'info', 'message':'Obtaining software allowed to run on this machine'})
-        self.event_queue.put({'type':'info', 'message':'Machine identified as "{}"'.format(platform.node())})
-        file_matrix = self.server_path / "Settings" / "Software_Per_Machine.csv"
-        if not file_matrix.is_file():
-            self.event_queue.put({'type':'error', 'message':'File "Software_Per_Machine.csv" not found in Settings folder on server'})
-            return set()
-        with file_matrix.open() as csv_file:
-            machine_name = platform.node()
-            dict_reader = csv.DictReader(csv_file)
-            for row in dict_reader:
-                if "Machine name" not in row:
-                    self.event_queue.put({'type':'error', 'message':'Column "Machine name" not defined in "Software_Per_Machine.csv'})
-                    return set()
-                elif row["Machine name"].upper() == machine_name.upper():
-                    return {app for app,value in row.items() if value=="1"}
-            return set()
-
-    def create_daemons(self):
-        '''Create daemons required in the application.
-        
-        Two daemons are created:
-            
-            - Daemon process: scans continuously database to check if there are new calculations to
-              perform (if number of processes selected allows it).
-            - Daemon receive: scans continuously database to check if there are new results to receive.'''
-
-        multiprocessing.Process(target=run_daemon_receive,
-                               args=(self.applications_with_receive(),
-                                    self.event_queue,
-                                    self.exit_program,
-                                    self.server_path,
-                                    self.settings)).start()
-        multiprocessing.Process(target=run_daemon_process,
-                               args=(self.applications_with_process(),
-                                    self.daemon_dedicated_process,
-                                    self.event_queue,
-                                    self.exit_program,
-                                    self.gui_answer,
-                                    self.server_path,
-                                    self.settings,
-                                    self.software_allowed_to_run)).start()
-        self.event_queue.put({'type':'info', 'message':'Created daemons'})
-
-    def submit_to_server(self, cases_to_submit, application, keep_running = True):
-        '''Submit cases to the server.
-        
-        Input files are zipped and copied to the file server. Cases are entered in mongo database.
-        
-        Args:
-            cases_to_submit: List of cases. Each case is a list of input files associated to a case.
-            application: Application associated to input files.
-            keep_running: Argument that can be associated to the state of a variable.
-                        When this variable is False, function ends.
-                        It is used to catch when user closes the progress window.'''
-
-        n_cases_submitted = 0  # keep track of number of cases submitted until end of function (or user closes progress window)       
-        for (count, (gui_case, case_files)) in enumerate(cases_to_submit):
-            if not keep_running:
-                break
-            self.event_queue.put({'type':'change progress', 'progress increment':1,
-                'progress label':'submitting case {}/{}'.format(count+1, len(cases_to_submit))})
-
-            with tempfile.TemporaryDirectory() as temp_directory:  # create a temporary folder to create zip file
-                zip_path = str(pathlib.Path(temp_directory) / "input_files")
-                with zipfile.ZipFile(zip_path, mode='w', compression=zipfile.ZIP_DEFLATED) as zip_case:
-                    for input_number, input_file in enumerate(case_files):
-                        if not keep_running:
-                            break
-                        if pathlib.Path(input_file).is_file():                 # if this is a file, we just write it
-                            zip_case.write(input_file, arcname = '{}_{}'.format(
-                                input_number, pathlib.Path(input_file).name))  # add position of file in its name
-                        elif pathlib.Path(input_file).is_dir():                # if this is a folder, we write full structure
-                            if not tuple(pathlib.Path(input_file).iterdir()):  # if folder empty, we just write empty folder
-                                zif = zipfile.ZipInfo('{}_{}/'.format(input_number, pathlib.Path(input_file).name))
-                                zip_case.writestr(zif, '')
-                            else:                                              # if this is a folder with contents
-                                empty_dirs = []                                # we keep track of all the empty directories
-                                for root, dirs, files in os.walk(input_file):
-                                    empty_dirs.extend([dir for dir in dirs if not tuple((pathlib.Path(root) / dir).iterdir())])
-                                    for name in files:
-                                        full_path = pathlib.Path(root) / name
-                                        archive_path = pathlib.Path('{}_{}'.format(
-                                            input_number, pathlib.Path(input_file).name)) / full_path.relative_to(pathlib.Path(input_file))
-                                        zip_case.write(str(full_path), arcname = str(archive_path))
-                                    for dir in empty_dirs:
-                                        full_path = pathlib.Path(root) / dir
-                                        archive_path = pathlib.Path('{}_{}/'.format(
-                                            input_number, pathlib.Path(input_file).name)) / full_path.relative_to(pathlib.Path(input_file))
-                                        zif = zipfile.ZipInfo('{}/'.format(archive_path))
-                                        zip_case.writestr(zif, '')
-                                    empty_dirs = []
-
-                # create folder structure if not existing: "Cases/user/machine/case"
-                cases_folder_relative_to_server = pathlib.Path("Cases") / getpass.getuser().upper() / platform.node().upper()
-                cases_folder_absolute = self.server_path / cases_folder_relative_to_server
-                os.makedirs(str(cases_folder_absolute), exist_ok = True)
-
-                if not keep_running:
-                    break
-
-                # copy case on file server with a unique name
-                case_path_relative_to_server = cases_folder_relative_to_server / str(bson.ObjectId())
-                case_path_absolute = self.server_path / case_path_relative_to_server
-                shutil.copy(src = zip_path, dst = str(case_path_absolute))
-
-                if not keep_running:
-                    break
-
-                # add case on database
-                db_case = {"user_group" : self.settings['user group'],
-                        "instance" : self.settings['instance'],
-                        "status" : "to process",
-                        "application": application,
-                        "origin" : {"machine" : platform.node(), "user" : getpass.getuser(),
-                                   'path':pathlib.Path(case_files[0]).as_posix(),
-                                   'time':{'start':datetime.datetime.now(), 'end':datetime.datetime(1, 1, 1)}},
-                        "processors" : {'processor_list':[],
-                                       "time":{'start':datetime.datetime.now(), 'end':datetime.datetime(1, 1, 1)}},
-                        'last_heartbeat' : datetime.datetime(1, 1, 1),
-                        'path' : case_path_relative_to_server.as_posix()}  # path name standardized
-                self.mongodb.cases.insert(db_case)
-
-                self.event_queue.put({'type':'submitted case', 'case':gui_case})  # update gui
-                n_cases_submitted += 1
-
-        self.event_queue.put({'type':'close progress'})
-        self.event_queue.put({'type':'info', 'message box':True,
-                                    'message':'1 case has been submitted successfully' if n_cases_submitted == 1
-                                    else '{} cases have been submitted successfully'.format(n_cases_submitted)})
-
-    def add_cases(self, files_selected, application, keep_running = True):
-        '''Add a list of cases to interface from files selected by user.
-        
-        A file selected can correspond to one or several cases to run. Each case being a list of input files.
-        Those cases are sent to the interface which displays the first input file of each case.
-        The application specific "send.py" function is used on each file selected.
-        
-        Args:
-            files_selected: Files selected by user
-            application: Application associated to input files
-            keep_running: Argument that can be associated to the state of a variable.
-                        When this variable is False, function ends.
-                        It is used to catch when user closes the progress window.'''
-
-        try:
-            send_module = return_module(application, "send")  # return app-specific send module
-        except:
-            self.event_queue.put({'type':'close progress'})
-            self.event_queue.put({'type':'error',
-                                 'message':'Error while importing "{}" send module'.format(application)})
-            return
-        for count, file_selected in enumerate(files_selected):
-            if not keep_running:
-                break
-            self.event_queue.put({'type':'change progress', 'progress increment':1,
-                'progress label':'getting cases from file {}/{}'.format(count+1, len(files_selected))})
-            try:
-                new_cases = send_module.select_input_files(file_selected)
-            except:
-                self.event_queue.put({'type':'close progress'})
-                self.event_queue.put({'type':'error',
-                                     'message':'Error while executing "select_input_files" from "{}" send module'.format(application)})
-                return
-            if type(new_cases) == type('') or not len(new_cases) or type(new_cases[0]) == type(''): # check return a list of cases (list of list of files)
-                self.event_queue.put({'type':'close progress'})
-                self.event_queue.put({'type':'error',
-                                     'message':'"select_input_files" from "{}" send module did not return a list of cases (each of these cases must be defined as a list of files)'.format(application)})
-                return
-            for new_case in new_cases:
-                self.event_queue.put({'type':'add case', 'case':new_case})
-        self.event_queue.put({'type':'close progress'})
-        self.event_queue.put({'type':'log_file_only', 'message':'Added cases to interface'})
-
-    def refresh_my_cases(self, keep_running = True):
-        '''Refresh "my cases" list.
-        
-        Access mongo database to display all user cases that have not been totally processed yet (ie not received by user).
-
-        Args:
-            keep_running: Argument that can be associated to the state of a variable.
-                        When this variable is False, function ends.
-                        It is used to catch when user closes the progress window.'''
-
-        total_to_process, total_to_receive = 0, 0
-        count_process = 0  # keep track of position of case to process in mongo database (ordered by submission date)
-        for case in self.mongodb.cases.find(spec = {
-            "user_group":self.settings['user group'], 'instance':self.settings['instance'], 
-            "status":{"$in":['to process', 'processing', 'processed']}},
-            fields=['status', 'application', 'origin.user', 'origin.machine', 'origin.path', 'processors.processor_list'], 
-            sort= [("_id",pymongo.ASCENDING)]):
-        
-            if not keep_running:
-                break
-            if case['status'] == 'to process':
-                count_process += 1
-            if case['origin']['user'] == getpass.getuser() and case['origin']['machine'] == platform.node():
-                if case['status'] == 'processed':
-                    total_to_receive += 1
-                else:
-                    total_to_process += 1
-                processor = '' if not case['processors']['processor_list'] else case['processors']['processor_list'][-1]['user']  # get latest processor (in case it failed)
-                status = case['status'] if case['status'] != 'to process' else 'wait #{}'.format(count_process)  # set to position in wait list
-                self.event_queue.put({'type':'add my case', 'cases to process': total_to_process, 'cases to receive': total_to_receive, 
-                                     'case':case['origin']['path'], 'application':case['application'], 'processor': processor, 'status':status})
-        self.event_queue.put({'type':'close progress'})
-        self.event_queue.put({'type':'log_file_only', 'message':'Refreshed "my cases" tab'})
-    
-    def create_report(self, file_report, keep_running = True):
-        '''Create a report of cases present on database.
-
-        Display cases and their details from database, limited to the ones from same "user group".
-
-        Args:
-            keep_running: Argument that can be associated to the state of a variable.
-                        When this variable is False, function ends.
-                        It is used to catch when user closes the progress window.'''
-
-        number_cases = self.mongodb.cases.find({'user_group':self.settings['user group']}).count()
-        self.event_queue.put({'type':'change progress max', 'progress maximum':number_cases})
-
-        # Headers
-        columns = ['Server Instance', 'Application', 'Current Path', 'Last signal to server',
-                'User Origin', 'Machine Origin', 'Path Origin', 'Current status',
-                'Time submitted by originator', 'Time started to process',
-                'Time finished to process', 'Time received by originator',
-                'Number of attempts to process', 'Processor User 1', 'Processor Machine 1',
-                'Processor User 2', 'Processor Machine 2', 'Processor User 3', 'Processor Machine 3']
-
-        with open(file_report, mode='w', encoding='utf8') as f:
-            print('Status of {}\n\n'.format(self.settings['user group']), file = f)
-            print('\t'.join(columns), file = f)
-
-            for (count, case) in enumerate(self.mongodb.cases.find(
-                spec = {'user_group':self.settings['user group']}, sort= [("_id",pymongo.ASCENDING)])):
-                if not keep_running:
-                    break
-
-                self.event_queue.put({'type':'change progress', 'progress increment':1,
-                    'progress label':'downloading case {}/{}'.format(count+1, number_cases)})
-                data=dict()
-                data['Server Instance'] = case['instance']
-                data['Application'] = case['application']
-                data['Current Path'] = case['path']
-                data['Last signal to server'] = '' if case['last_heartbeat'] == datetime.datetime(1, 1, 1) else case['last_heartbeat']
-                data['User Origin'] = case['origin']['user']
-                data['Machine Origin'] = case['origin']['machine']
-                data['Path Origin'] = case['origin']['path']
-                data['Current status'] = case['status']
-                data['Time submitted by originator'] = case['origin']['time']['start']
-                data['Time started to process'] = '' if case['processors']['time']['start'] == datetime.datetime(1, 1, 1) else case['processors']['time']['start']
-                data['Time finished to process'] = '' if case['processors']['time']['end'] == datetime.datetime(1, 1, 1) else case['processors']['time']['end']
-                data['Time received by originator'] = '' if case['origin']['time']['end'] == datetime.datetime(1, 1, 1) else case['origin']['time']['end']
-                processors = case['processors']['processor_list']
-                data['Number of attempts to process'] = len(processors)                
-                data['Processor User 1'] = ''
-                data['Processor Machine 1'] = ''
-                data['Processor User 2'] = ''
-                data['Processor Machine 2'] = ''
-                data['Processor User 3'] = ''
-                data['Processor Machine 3'] = ''
-                if processors:
-                    data['Processor User 1'] = processors[0]['user']
-                    data['Processor Machine 1'] = processors[0]['machine']
-                if len(processors) >= 2:
-                    data['Processor User 2'] = processors[1]['user']
-                    data['Processor Machine 2'] = processors[1]['machine']
-                if len(processors) >= 3:
-                    data['Processor User 3'] = processors[2]['user']
-                    data['Processor Machine 3'] = processors[2]['machine']
-                print('\t'.join(str(data[k]) for k in columns), file = f)
-
-        self.event_queue.put({'type':'close progress'})
-        self.event_queue.put({'type':'info', 'message':'Created report from database in {}'.format(str(pathlib.Path(file_report))), 'message box':True})
-
-    def exit_processes(self):
-        '''Terminate program.
-        
-        Ensure daemon process (and its child processes) and daemon receive terminate properly.'''
-
-        self.exit_program.set()  # This value is scanned by daemons to know when to exit
-        for p in multiprocessing.active_children():
-            p.join()
-        try:
-            os.remove(str(config.pid_file))
-        except OSError:
-            pass
-        self.event_queue.put({'type':'exit'})
-
-def check_quit_program(exit_program):
-    '''Function used by daemons to check if they need to terminate and kill their child processes.
-    
-    Args:
-        exit_program: Variable scanned by daemons to know when to exit.'''
-    
-    if exit_program.is_set():
-        for p in multiprocessing.active_children():
-            p.terminate()
-        for p in multiprocessing.active_children():
-            p.join(1)
-        raise SystemExit
-
-def refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, paused_process):
-    '''Refresh status variables used by daemon process.
-    
-    Args:
-        alive_process: List of processes alive.
-        dedicated_process: Number of dedicated process selected in gui.
-        event_queue: Queue of events to process by gui.
-        exit_program: Variable scanned by daemons to know when to exit.
-        gui_answer: Notify when gui answered a question.
-        paused_process: List of processes currently on pause.
-    '''
-    
-    check_quit_program(exit_program)
-
-    # Notifies user if process need to be stopped when user select 0 process
-    if not dedicated_process.value and len(multiprocessing.active_children()):
-        gui_answer.clear()
-        event_queue.put({'type':'terminate process?'})
-        gui_answer.wait()
-        if not dedicated_process.value:            # user confirmed all processes need to terminate
-            if len(multiprocessing.active_children()):
-                event_queue.put({'type':'info', 'message':'Terminating every running process'})
-                for p in multiprocessing.active_children():
-                    p.terminate()
-                for p in multiprocessing.active_children():
-                    p.join()
-                while multiprocessing.active_children():
-                    time.sleep(1)    # ensure all process have finished
-                paused_process = []  # ensure that list is empty if process not terminated yet
-
-    # Update paused_process. Check that processes paused are actually not terminated
-    for p in paused_process:
-        if not p.is_alive():
-            paused_process.remove(p)
-
-    # Check whether running processes displayed in GUI have finished
-    for p in alive_process:
-        if p['process'].is_alive():
-            # send heartbeat to mongodb on each case if it has been long enough
-            if (datetime.datetime.now() - p['last heartbeat']).total_seconds() > config.db_heartbeat_frequency:
-                mongodb.cases.update({'_id':p['_id']}, {'$set': {'last_heartbeat': datetime.datetime.now()}})
-                p['last heartbeat'] = datetime.datetime.now()
-        else:
-            event_queue.put({'type':'remove my process', 'pid':p['process'].pid})
-            alive_process.remove(p)
-
-def run_daemon_process(applications_with_process, dedicated_process, event_queue, exit_program, gui_answer, server_path, settings, software_allowed_to_run):
-    '''Run "daemon process" that launches new processes when possible.
-    
-    Daemon process runs continuously and check on database if processes are available to launch when user allows it.
-    
-    Args:
-        applications_with_process: dictionary of applications that have a process function
-        dedicated_process: number of dedicated process selected in gui
-        event_queue: queue of events to process by gui
-        exit_program: variable scanned by daemons to know when to exit
-        gui_answer: notify when gui answered a question
-        server_path: path of file server as defined in "server.txt" file
-        settings: list of settings from settings.txt on file server
-        software_allowed_to_run: set of applications that can run as defined in "Software_Per_Machine.csv"
-    '''
-
-    event_queue.put({'type':'log_file_only', 'message':'Starting daemon process'})
-    if not (len(software_allowed_to_run) * len(applications_with_process)):
-        # current machine will not be able to process any case
-        event_queue.put({'type':'info', 'message box':True, 'message':'Possible applications to perform calculations: None'})
-        return
-    possible_apps = list(software_allowed_to_run & set(applications_with_process.keys()))
-    possible_apps.sort()
-    event_queue.put({'type':'info', 'message':'Possible applications to perform calculations: {}'.format(possible_apps)})
-
-    # create new connection
-    mongodb = pymongo.MongoClient('{}'.format(settings['mongodb server'])).gridcompute
-    mongodb.authenticate(settings['user group'], settings['password'])
-
-    last_access_no_case = datetime.datetime(1, 1, 1)  # last time db was accessed and no case was present
-    paused_process = []  # keep track of all processes that have been paused
-    alive_process = []   # keep track of all processes that are alive
-
-    while True:
-        refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, paused_process)
-        time.sleep(config.daemon_pause)
-        refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, paused_process)
-
-        # some process might need to pause (if user decreased number of allowed processes)
-        if dedicated_process.value < (len(multiprocessing.active_children()) - len(paused_process)):
-
-            # get process that we can pause
-            p_children = multiprocessing.active_children()
-            p_possible_new_pause = [p for p in p_children if p not in paused_process]
-
-            for i in range(len(p_children) - len(paused_process) - dedicated_process.value):
-                try:  # ensure does not fail in case process terminated unexpectedly
-                    event_queue.put({'type':'info', 'message':'Pausing one process'})
-                    psutil.Process(p_possible_new_pause[i].pid).suspend()
-                    paused_process.append(p_possible_new_pause[i])
-                    event_queue.put({'type':'change my process', 'pid':p_possible_new_pause[i].pid, 'status':'paused'})
-                    event_queue.put({'type':'log_file_only', 'message':'Paused one process'})
-                except:
-                    pass
-
-        # some process might need to be created or restart
-        elif dedicated_process.value > (len(multiprocessing.active_children()) - len(paused_process)):
-
-            # restart process
-            while paused_process and (dedicated_process.value > (len(multiprocessing.active_children()) - len(paused_process))):
-                event_queue.put({'type':'info', 'message':'Resuming a paused process'})
-                p = paused_process.pop()
-                try:  # ensure does not fail if process terminated unexpectedly
-                    psutil.Process(p.pid).resume()
-                    event_queue.put({'type':'change my process', 'pid':p.pid, 'status':'processing'})
-                    event_queue.put({'type':'log_file_only', 'message':'Resumed a paused process'})
-                except:
-                    pass
-                  
-            # try to create new process (no more processses are suspended)
-            if dedicated_process.value > len(multiprocessing.active_children()):
-
-                # check it has been a long time enough since last check of database with nothing to process
-                if (datetime.datetime.now() - last_access_no_case).total_seconds() > config.db_connect_frequency:
-                    event_queue.put({'type':'log_file_only', 'message':'Trying to get new cases from database'})
-                    try_new_case = True  # we can try to get new case to process from database
-
-                    while try_new_case:
-                        refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, paused_process)
-
-                        # try to get a case that has a too long last_heartbeat
-                        limit_last_heartbeat = datetime.datetime.now() - datetime.timedelta(seconds=config.db_heartbeat_dead)
-                        case_to_process = mongodb.cases.find_and_modify(
-                                query={"user_group":settings['user group'], 'instance':settings['instance'], "status":"processing", 'last_heartbeat':{'$lt':limit_last_heartbeat},"application":{"$in":possible_apps}},
-                                sort= [("_id", pymongo.ASCENDING)],
-                                fields= ['path', 'application', 'origin.user', 'origin.machine', 'processors.processor_list'],
-                                update={"$set":{'last_heartbeat': datetime.datetime.now(), 'processors.time.start': datetime.datetime.now()},
-                                    '$push':{'processors.processor_list': {'machine': platform.node(), 'user': getpass.getuser()}}})
-
-                        if case_to_process is None:
-                            # get a new case (returns original fields and not updated ones)
-                            case_to_process = mongodb.cases.find_and_modify(
-                                    query={"user_group":settings['user group'], 'instance':settings['instance'], "status":"to process", "application":{"$in":possible_apps}}, sort= [("_id", pymongo.ASCENDING)],
-                                    fields= ['path', 'application', 'origin.user', 'origin.machine', 'processors.processor_list'],
-                                    update={"$set":{'status': 'processing', 'last_heartbeat': datetime.datetime.now(), 'processors.time.start': datetime.datetime.now()},
-                                        '$push':{'processors.processor_list': {'machine': platform.node(), 'user': getpass.getuser()}}})
-
-                        refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, paused_process)
-
-                        if case_to_process is None:
-                            # there is currently no case to run, try later
-                            try_new_case = False
-                            last_access_no_case = datetime.datetime.now()
-                            event_queue.put({'type':'log_file_only', 'message':'No cases are currently available on database'})
-
-                        else:
-                            # check that case has not failed to process already 3 times
-                            if len(case_to_process['processors']['processor_list']) >= 3:
-                                event_queue.put({'type':'info', 'message':'A case from database has failed too many times'})
-                                mongodb.cases.update({'_id':case_to_process['_id']},
-                                                     {'$set': {'status': 'error: case failed to process already 3 times', 'processors.time.end': datetime.datetime.now()},
-                                                     '$pop': {'processors.processor_list':1}})  # remove current processor from list since operation is cancelled
-
-                            else:
-                                # launch the case
-                                new_process = multiprocessing.Process(target=launch_process, daemon = True,
-                                                                     args=(case_to_process, event_queue, server_path, settings))
-                                new_process.start()
-
-                                # keep track of process for gui
-                                event_queue.put({'type':'add my process', 'pid':new_process.pid, 'start':datetime.datetime.now(), 'application':case_to_process['application'],
-                                                'originator': case_to_process['origin']['user'], 'status':'processing'})
-                                alive_process.append({'_id':case_to_process['_id'], 'process':new_process, 'last heartbeat':datetime.datetime.now()})
-                        
-                            try_new_case = dedicated_process.value > len(multiprocessing.active_children())
-
-
-def launch_process(case, event_queue, server_path, settings):
-    '''Launch one process from database.
-
-    Mongo database is updated when process finishes.
-    
-    Args:
-        case: case to process obtained from mongo database.
-        event_queue: queue of events to process by gui.
-        server_path: path of file server as defined in "server.txt" file.
-        settings: list of settings from settings.txt on file server.
-    '''
-
-    event_queue.put({'type':'log_file_only', 'message':'Launching case {}'.format(case['_id'])})
-    case_server_path_absolute = server_path / case['path']
-    if not case_server_path_absolute.is_file():
-        if server_path.is_dir():  # check that server is still accessible
-            # create new connection
-            mongodb = pymongo.MongoClient("{}".format(settings['mongodb server'])).gridcompute
-            mongodb.authenticate(settings['user group'], settings['password'])
-            # mark file as not existing
-            mongodb.cases.update({'_id':case['_id']}, {'$set': {'status': 'error: file input not found', 'processors.time.end': datetime.datetime.now()}})
-            event_queue.put({'type':'info', 'message':'Error: File input for case {} not found at {}'.format(case['_id'], case['path'])})
-        else:
-            event_queue.put({'type':'critical', 'message':'Server not accessible at {}'.format(server_path)})
-            raise SystemExit
-    else:
-        # Prepare temporary folder to run the case
-        with tempfile.TemporaryDirectory() as temp_directory:
-            event_queue.put({'type':'log_file_only', 'message':'Launching case {} in {}'.format(case['_id'], temp_directory)})
-            case_path = str(pathlib.Path(temp_directory) / pathlib.Path(case['path']).name)
-            shutil.copy(src = str(case_server_path_absolute), dst = case_path)
-            # extract all files and remove zip file
-            with zipfile.ZipFile(case_path) as zip_case:
-                zip_case.extractall(temp_directory)
-            os.remove(case_path)
-
-            # list files and rename them as originally (without their position indicator)
-            list_files = []  # list containing tuple (position, original file name)
-            input_files_numbered = tuple(pathlib.Path(temp_directory).iterdir())
-            for file in input_files_numbered:
-                position, original_name = file.name.split('_', 1)
-                original_file = pathlib.Path(temp_directory) / original_name
-                file.rename(pathlib.Path(original_file))
-                list_files.append((int(position), original_file))
-
-            # list files as they were sent to server
-            original_files_sorted = tuple(x[1].as_posix() for x in sorted(list_files))
-
-            # Load module for processing the case
-            try:
-                process_module = return_module(case['application'], 'process')
-            except:
-                event_queue.put({'type':'error', 'message':'Error while importing "{}" process module\nProcess daemon exiting'.format(case['application'])})
-                return
-            
-            # Process and return output files
-            try:
-                output_files = process_module.process_case(original_files_sorted)
-            except:
-                event_queue.put({'type':'error', 'message':'Error while executing "process_case" from "{}" process module'.format(case['application'])})
-                return
-
-            # zip all output files
-            zip_output = str(pathlib.Path(temp_directory) / "output_files")
-            with zipfile.ZipFile(zip_output, mode='w', compression=zipfile.ZIP_DEFLATED) as zip_case:
-                for output_number, output_file in enumerate(output_files):
-                    # create zip file and add position of file in its name
-                    if pathlib.Path(output_file).is_file(): # if this is a file, we just write it
-                        zip_case.write(output_file, arcname = '{}_{}'.format(output_number, pathlib.Path(output_file).name))
-                    elif pathlib.Path(output_file).is_dir(): # if this is a folder, we write full structure
-                        if not tuple(pathlib.Path(output_file).iterdir()): # if folder empty, we just write empty folder
-                            zif = zipfile.ZipInfo('{}_{}/'.format(output_number, pathlib.Path(output_file).name))
-                            zip_case.writestr(zif, '')
-                        else: # this is a folder with contents
-                            empty_dirs = [] # we keep track of all the empty directories
-                            for root, dirs, files in os.walk(output_file):
-                                empty_dirs.extend([dir for dir in dirs if not tuple((pathlib.Path(root) / dir).iterdir())])
-                                for name in files:
-                                    full_path = pathlib.Path(root) / name
-                                    archive_path = pathlib.Path('{}_{}'.format(output_number, pathlib.Path(output_file).name)) / full_path.relative_to(pathlib.Path(output_file))
-                                    zip_case.write(str(full_path), arcname = str(archive_path))
-                                for dir in empty_dirs:
-                                    full_path = pathlib.Path(root) / dir
-                                    archive_path = pathlib.Path('{}_{}/'.format(output_number, pathlib.Path(output_file).name)) / full_path.relative_to(pathlib.Path(output_file))
-                                    zif = zipfile.ZipInfo('{}/'.format(archive_path))
-                                    zip_case.writestr(zif, '')
-                                empty_dirs = []
-
-            # create folder structure if not existing: "Cases/user/machine/case"
-            results_folder_relative_to_server = pathlib.Path('Results') / case['origin']['user'].upper() / case['origin']['machine'].upper()
-            results_folder_absolute = server_path / results_folder_relative_to_server
-            os.makedirs(str(results_folder_absolute), exist_ok = True)
-
-            # copy case using unique identifier on file server
-            result_path_relative_to_folder = results_folder_relative_to_server / pathlib.Path(case['path']).name
-            result_path_absolute = server_path / result_path_relative_to_folder
-            shutil.copy(src = zip_output, dst = str(result_path_absolute))
-
-        # create new connection
-        mongodb = pymongo.MongoClient("{}".format(settings['mongodb server'])).gridcompute
-        mongodb.authenticate(settings['user group'], settings['password'])
-        # mark case on database as processed
-        mongodb.cases.update({'_id':case['_id']}, {'$set': {'status': 'processed', 'path': result_path_relative_to_folder.as_posix(), 'processors.time.end': datetime.datetime.now()}})
-
-        # remove case from cases folder
-        os.remove(str(case_server_path_absolute))
-
-    event_queue.put({'type':'log_file_only', 'message':'Processed case {}'.format(case['_id'])})
-
-def run_daemon_receive(applications_with_receive, event_queue, exit_program, server_path, settings):
-    '''Run "daemon receive" that retrieve back cases from server after they have been processed.
-    
-    Daemon receive runs continuously and check on database if output files are available.
-    
-    Args:
-        applications_with_receive: dictionary of applications that have a process function.
-        event_queue: queue of events to process by gui.
-        exit_program: variable scanned by daemons to know when to exit.
-        server_path: path of file server as defined in "server.txt" file.
-        settings: list of settings from settings.txt on file server.
-    '''
-
-    if not len(applications_with_receive):
-        event_queue.put({'type':'info', 'message box':True, 'message':'Possible applications to receive calculations: None'})
-        return
-    possible_apps = list(applications_with_receive.keys())
-    possible_apps.sort()
-    event_queue.put({'type':'info', 'message':'Possible applications to receive calculations: {}'.format(possible_apps)})
-
-    # create new connection
-    mongodb = pymongo.MongoClient('{}'.format(settings['mongodb server'])).gridcompute
-    mongodb.authenticate(settings['user group'], settings['password'])
-    
-    while True:
-        check_quit_program(exit_program)
-
-        case_to_receive = mongodb.cases.find_one({
-            "user_group":settings['user group'], 'instance':settings['instance'], "status":"processed",
-            'origin.user':getpass.getuser(), 'origin.machine':platform.node(),
-            "application":{"$in":possible_apps}},
-            fields= ['path', 'application', 'origin.user'])
-
-        if case_to_receive is None:
-            # there is currently no case to receive
-            wait_remaining = config.db_connect_frequency
-            check_quit_program(exit_program)
-            while wait_remaining > 0:
-                time.sleep(min(wait_remaining, config.daemon_pause))
-                wait_remaining -= config.daemon_pause
-                check_quit_program(exit_program)
-
-        elif not (server_path / case_to_receive['path']).is_file():
-            if server_path.is_dir():  # check that server is still accessible
-                mongodb.cases.update({'_id':case_to_receive['_id']}, {'$set': {'status': 'error: file output not found', 'processors.time.end': datetime.datetime.now()}})
-                event_queue.put({'type':'info', 'message':'Error: File onput for case {} not found at {}'.format(case_to_receive['_id'], case_to_receive['path'])})
-            else:
-                event_queue.put({'type':'critical', 'message':'Server not accessible at {}'.format(server_path)})
-                raise SystemExit
-        else:
-            event_queue.put({'type':'log_file_only', 'message':'Receiving case {}'.format(case_to_receive['_id'])})
-            event_queue.put({'type':'add my process', 'pid':os.getpid(), 'start':datetime.datetime.now(), 'application':case_to_receive['application'], 'originator': case_to_receive['origin']['user'], 'status':'receiving'})
-
-            case_to_receive_absolute = server_path / case_to_receive['path']
-            # Prepare temporary folder to receive the case
-            with tempfile.TemporaryDirectory() as temp_directory:
-                event_queue.put({'type':'log_file_only', 'message':'Processing request to receive case {} in {}'.format(case_to_receive['_id'], temp_directory)})
-                case_path = str(pathlib.Path(temp_directory) / pathlib.Path(case_to_receive['path']).name)
-                shutil.copy(src = str(case_to_receive_absolute), dst = case_path)
-                # extract all files and remove zip file
-                with zipfile.ZipFile(case_path) as zip_case:
-                    zip_case.extractall(temp_directory)
-                os.remove(case_path)
-
-                # list files and rename them as originally (without their position indicator)
-                list_files = [] # list containing tuple (position, original file name)
-                output_files_numbered = tuple(pathlib.Path(temp_directory).iterdir())
-                for file in output_files_numbered:
-                    position, original_name = file.name.split('_', 1)
-                    original_file = pathlib.Path(temp_directory) / original_name
-                    file.rename(pathlib.Path(original_file))
-                    list_files.append((int(position), original_file))
-
-                # list files as they were sent to server
-                original_files_sorted = tuple(x[1].as_posix() for x in sorted(list_files))
-
-                # Load module for receiving the case
-                try:
-                    receive_module = return_module(case_to_receive['application'], 'receive')
-                except:
-                    event_queue.put({'type':'error', 'message':'Error while importing "{}" receive module\nReceive daemon exiting'.format(case_to_receive['application'])})
-                    return
-
-                # Execute receive function
-                try:
-                    receive_module.receive_case(original_files_sorted)
-                except:
-                    event_queue.put({'type':'error', 'message':'Error while executing "receive_case" from "{}" receive module\nReceive daemon about to exit'.format(case_to_receive['application'])})
-                    return
-
-            # mark case on database as received
-            mongodb.cases.update({'_id':case_to_receive['_id']}, {'$set': {'status': 'received', 'path': '', 'origin.time.end': datetime.datetime.now()}})
-
-            # remove case from results folder
-            os.remove(str(case_to_receive_absolute))
-            
-            event_queue.put({'type':'log_file_only', 'message':'Received case {}'.format(case_to_receive['_id'])})
-            event_queue.put({'type':'remove my process', 'pid':os.getpid()})
-
-
-def return_module(application, function):
-    ''' import app-specific function send, process or receive '''
-    if function == "send":
-        return importlib.import_module("{}.send".format(application))
-    elif function == 'process':
-        return importlib.import_module("{}.process".format(application))
-    elif function == 'receive':
-        return importlib.import_module("{}.receive".format(application))
-
-
-if __name__ == "__main__":
-    event_queue = multiprocessing.Queue()
-    test_server = Server(event_queue)
+'''This module contains all server related functionalities.
+ 
+It creates server variables associated to file server and mongo database
+and handle the communication with them.'''
+
+# Copyright 2014 Boris Dayma
+# 
+# This file is part of GridCompute.
+# 
+# GridCompute is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+# 
+# GridCompute is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For any question, please contact Boris Dayma at boris.dayma@gmail.com
+
+
+import bisect
+import collections
+import concurrent.futures
+import csv
+import datetime
+import hashlib
+import importlib.machinery, importlib.util
+import marshal
+import multiprocessing
+import os
+import pathlib
+import queue
+import shutil
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zipfile, zlib
+
+import bson
+import psutil
+import pymongo
+
+import g_config as config
+
+
+no_date = datetime.datetime(1, 1, 1)  # date stored on database when an event has not happened yet
+loaded_modules = dict()    # app-specific scripts imported in current process, by path
+process_client = None      # client connected to mongo database from current process
+process_client_pid = None  # pid of the process that created "process_client"
+cases_indexes = [pymongo.IndexModel(keys) for keys in config.db_cases_indexes]  # indexes matching queries on cases
+
+
+class Server:
+    '''Class handling server-related functionalities.
+
+    File server path is taken from "server.txt" present at root of program.  Settings are taken from
+    "settings.txt" present on the file server.
+    
+    Server properties are set at initialization.
+
+    Args:
+        event_queue: queue of events to process by gui
+        daemon_event_queue: queue of events sent by daemon processes, forwarded to event_queue, created with daemons
+        receive_thread: thread running daemon receive, created with daemons
+        gui_dedicated_process: number of dedicated process selected in gui
+        daemon_dedicated_process: number of dedicated process communicated to daemon process
+        exit_program: variable scanned by daemons to know when to exit
+        gui_answer: notify when gui answered a question
+        server_path: path of file server as defined in "server.txt" file
+        app_path: path of applications-specific scripts
+        settings_path: path of settings.txt file
+        settings_entries: Dictionary of directory entries present in Settings folder, by lowercase name
+        settings: list of settings from settings.txt on file server including:
+
+                  - mongodb server: Address of the mongo instance including connection port containing
+                    "gridcompute" like ``mongodbserver.com:888`` or ``10.0.0.1:888`` or ``Machine123:888``.
+                  - user group: Login used to connect on mongo database.
+                  - password: Password used to connect on mongo database.
+                  - instance: Data instance to consider like ``0`` or ``debug``.
+
+        mongo_client: Client connected to mongo server
+        mongodb: Connection to mongo database
+        case_events: "case_events" collection notifying daemons of new cases, None if not available
+        server_functions: Dictionary of application-specific scripts. The key is application name and value is
+                        a dictionary of following keys:
+
+                        - path: path of application folder
+                        - send, process, receive: path of script defining these functions, None if not existing
+
+        applications: applications grouped by function among "send", "process" and "receive", sorted by name
+        software_allowed_to_run: set of applications that can run as defined in "Software_Per_Machine.csv"
+    '''
+
+    def __init__(self, event_queue, dedicated_process):
+        
+        self.event_queue = event_queue
+        self.daemon_event_queue = None  # created with daemons
+        self.receive_thread = None      # created with daemons
+        self.gui_dedicated_process = dedicated_process
+        self.gui_dedicated_process.trace('w', self.notify_number_process_daemon)
+        self.daemon_dedicated_process = multiprocessing.Value('i', 0)
+        self.exit_program = multiprocessing.Event()
+        self.exit_program.clear()
+        self.gui_answer = multiprocessing.Event()
+
+        server_file = pathlib.Path("server.txt")
+        if not server_file.is_file():
+            self.event_queue.put({'type':'critical', 'message':'File server.txt not found in current directory'})
+            raise SystemExit
+        with server_file.open() as f:
+            server_path_name = f.read().strip()
+        self.server_path = pathlib.Path(server_path_name)
+        if not self.server_path.is_dir():
+            self.event_queue.put({'type':'critical', 'message':'File server.txt does not define an accessible directory'})
+            raise SystemExit
+        settings_folder = self.server_path / "Settings"
+        try:
+            self.settings_entries = self.scan_settings_folder(settings_folder)
+        except OSError:
+            self.event_queue.put({'type':'critical', 'message':'Settings folder not found at\n{}'.format(str(settings_folder))})
+            raise SystemExit
+
+        self.app_path = self.server_path / "Settings" / "Applications"
+        self.settings_path = self.server_path / "Settings" / "settings.txt"
+        self.settings = self.get_settings()
+        self.mongodb = self.access_mongodb()
+        self.case_events = open_case_events(self.mongodb)
+        self.handle_software_permissions()
+        self.server_functions = self.scan_applications()
+        self.applications = self.group_applications()
+        self.software_allowed_to_run = self.get_software_allowed_to_run()
+        self.event_queue.put({'type':'info', 'message':'Logged on grid "{}" instance "{}"'.format(self.settings['user group'], self.settings['instance'])})
+
+        self.create_daemons()  # daemons can start
+
+    def forward_daemon_events(self):
+        '''Forward events sent by daemon processes to the gui.
+
+        Gui events are exchanged within a single process, so only daemon processes use a
+        multiprocessing queue.'''
+
+        while True:
+            self.event_queue.put(self.daemon_event_queue.get())
+
+    def notify_number_process_daemon(self, *args):
+        '''Notify the daemon process of a change of number of processes selected in GUI.'''
+
+        self.daemon_dedicated_process.value = int(self.gui_dedicated_process.get())
+
+    def scan_settings_folder(self, settings_folder):
+        '''List the content of Settings folder on file server in a single request.
+
+        Directory entries keep the type of files, so presence of settings files is then checked without
+        accessing file server again.
+
+        Args:
+            settings_folder: path of Settings folder on file server.
+
+        Returns:
+            dict: the key is the lowercase name of file or folder (case-insensitive as on Windows) and the
+            value is its ``os.DirEntry``.'''
+
+        with os.scandir(str(settings_folder)) as entries:
+            return {entry.name.lower() : entry for entry in entries}
+
+    def is_settings_file(self, name):
+        '''Return True if a file with this name is present in Settings folder.'''
+
+        entry = self.settings_entries.get(name.lower())
+        return entry is not None and entry.is_file()
+
+    def get_settings(self):
+        '''Initialize settings variable from "settings.txt" present on server.'''
+
+        if not self.is_settings_file("settings.txt"):
+            self.event_queue.put({'type':'critical', 'message':'File settings.txt not found in Settings directory'})
+            raise SystemExit
+        settings = dict()
+        with self.settings_path.open() as f:
+            for line in f:
+                key, separator, value = line.partition(':')
+                if separator:  # lines without a setting are ignored
+                    settings[key.strip()] = value.strip()
+
+        required_settings = {'mongodb server', 'instance', 'user group', 'password'}
+        if not all(k in settings for k in required_settings):
+            missing_settings = required_settings - settings.keys()
+            self.event_queue.put({'type':'critical', 
+                                 'message':'"settings.txt" missing data:\n{}'.format(
+                                     '\n'.join('"{}"'.format(x) for x in missing_settings))})
+            raise SystemExit
+        self.event_queue.put({'type':'info', 'message':'Accessed "settings.txt" properties'})
+        return settings
+
+    def access_mongodb(self):
+        '''Access the mongo database.'''
+
+        # credentials are given to the client so that authentication is done when connecting
+        try:
+            client = connect_mongodb(self.settings)
+            client.admin.command('ping')
+        except pymongo.errors.OperationFailure:
+            self.event_queue.put({'type':'critical',
+                                 'message':'You are not authorized to use this software.\nPlease check "user group" and "password" settings.'})
+            raise SystemExit
+        except:
+            self.event_queue.put({'type':'critical',
+                                 'message':'Database currently not accessible.\nPlease check your connection and "mongodb server" setting.'})
+            raise SystemExit
+        self.mongo_client = client  # closed when exiting program
+        mongodb = client.gridcompute
+        self.event_queue.put({'type':'info', 'message':'Accessed mongo database'})
+        return mongodb
+
+    def handle_software_permissions(self):
+        '''Verify that mongo database allows current version of program to run.
+        
+        This is based on the collection "versions" present in mongo database.
+        If "versions" collection is not present, a warning is displayed.'''
+
+        version = self.mongodb.versions.find_one({'_id':str(config.version)}, projection=['status', 'message'])
+        if version is None:
+            # collections are only listed when the version is not found, to explain why
+            if not self.mongodb.list_collection_names(filter={'name':'versions'}):
+                self.event_queue.put({'type':'warning',
+                                    'message':'Mongo database does not contain a "versions" collection.\nData may be corrupted and program unstable.'})
+            self.event_queue.put({'type':'critical', 'message':'Error: Version {} is not valid'.format(config.version)})
+            raise SystemExit
+        elif version['status'] == 'warning':
+            self.event_queue.put({'type':'warning', 'message':version['message']})
+        elif version['status'] == 'refused':
+            self.event_queue.put({'type':'critical', 'message':version['message']})
+            raise SystemExit
+        else:
+            self.event_queue.put({'type':'info', 'message':'Current version of program is valid'})
+
+    def scan_applications(self):
+        '''Scan application specific scripts present on file server.'''
+
+        # directory entries keep file types, so each folder is listed once without checking each script
+        applications = dict()
+        app_folder = self.settings_entries.get("applications")
+        if app_folder is None or not app_folder.is_dir():
+            self.event_queue.put({'type':'info', 'message':'No application specific scripts found'})
+            return applications
+        with os.scandir(str(self.app_path)) as folders:
+            for folder in folders:
+                if folder.is_dir():
+                    with os.scandir(folder.path) as entries:
+                        # case-insensitive as on Windows, keeping actual name for case-sensitive file servers
+                        scripts = {entry.name.lower(): pathlib.Path(entry.path) for entry in entries if entry.is_file()}
+                    applications[folder.name] = {"path" : pathlib.Path(folder.path), "send" : scripts.get("send.py"),
+                                                 "process" : scripts.get("process.py"),
+                                                 "receive" : scripts.get("receive.py")}
+        self.event_queue.put({'type':'info', 'message':'Scanned application specific scripts'})
+        return applications
+
+    def group_applications(self):
+        '''Return applications grouped by the functions they define.
+
+        Applications are scanned only once, so groups are computed once and reused.
+
+        Returns:
+            dict: the key is either "send", "process" or "receive" and the value is a dictionary of applications
+            defining this function, sorted by name, where key is the application name and value is the script path.'''
+
+        applications = sorted(self.server_functions.items())
+        return {function : {app : scripts[function] for app, scripts in applications if scripts[function] is not None}
+                for function in ("send", "process", "receive")}
+
+    def applications_with_send(self):
+        '''Return a dictionary of applications that have a send function.
+
+        The key is the application name and the value is the script path.'''
+
+        return self.applications["send"]
+
+    def applications_with_process(self):
+        '''Return a dictionary of applications that have a process function.
+
+        The key is the application name and the value is the script path.'''
+
+        return self.applications["process"]
+
+    def applications_with_receive(self):
+        '''Return a dictionary of applications that have a receive function.
+
+        The key is the application name and the value is the script path.'''
+
+        return self.applications["receive"]
+
+    def get_software_allowed_to_run(self):
+        '''Return the list of software allowed to run on this machine per "Software_Per_Machine.csv"
+        present on file server.'''
+
+        self.event_queue.put({'type':'info', 'message':'Obtaining software allowed to run on this machine'})
+        self.event_queue.put({'type':'info', 'message':'Machine identified as "{}"'.format(config.machine_name)})
+        file_matrix = self.server_path / "Settings" / "Software_Per_Machine.csv"
+        if not self.is_settings_file("Software_Per_Machine.csv"):
+            self.event_queue.put({'type':'error', 'message':'File "Software_Per_Machine.csv" not found in Settings folder on server'})
+            return set()
+        with file_matrix.open(newline='', buffering=config.file_buffer_size) as csv_file:
+            dict_reader = csv.DictReader(csv_file)
+            if "Machine name" not in (dict_reader.fieldnames or ()):
+                self.event_queue.put({'type':'error', 'message':'Column "Machine name" not defined in "Software_Per_Machine.csv'})
+                return set()
+            machine_name = config.machine_name.upper()
+            for row in dict_reader:
+                if row["Machine name"].upper() == machine_name:
+                    return {app for app,value in row.items() if value=="1"}
+            return set()
+
+    def create_daemons(self):
+        '''Create daemons required in the application.
+        
+        Two daemons are created:
+            
+            - Daemon process: scans continuously database to check if there are new calculations to
+              perform (if number of processes selected allows it).
+            - Daemon receive: scans continuously database to check if there are new results to receive.
+              It only waits for database and file server, so it runs in a thread of current process and
+              shares its gui queue and mongo client.
+
+        The queue used by daemon process to send events, and the thread forwarding them to the gui, are only
+        created here so that no feeder thread or pickling is involved until a child process exists.'''
+
+        self.daemon_event_queue = multiprocessing.Queue()
+        threading.Thread(target=self.forward_daemon_events, daemon=True).start()
+        self.receive_thread = threading.Thread(target=run_daemon_receive, daemon=True,
+                                               args=(self.applications_with_receive(),
+                                                     self.event_queue,
+                                                     self.exit_program,
+                                                     self.server_path,
+                                                     self.settings))
+        self.receive_thread.start()
+        multiprocessing.Process(target=run_daemon_process,
+                               args=(self.applications_with_process(),
+                                    self.daemon_dedicated_process,
+                                    self.daemon_event_queue,
+                                    self.exit_program,
+                                    self.gui_answer,
+                                    self.server_path,
+                                    self.settings,
+                                    self.software_allowed_to_run)).start()
+        self.event_queue.put({'type':'info', 'message':'Created daemons'})
+
+    def submit_to_server(self, cases_to_submit, application, keep_running = True):
+        '''Submit cases to the server.
+        
+        Input files are zipped and copied to the file server. Cases are entered in mongo database.
+        
+        Args:
+            cases_to_submit: List of cases. Each case is a list of input files associated to a case.
+            application: Application associated to input files.
+            keep_running: Argument that can be associated to the state of a variable.
+                        When this variable is False, function ends.
+                        It is used to catch when user closes the progress window.'''
+
+        n_cases_submitted = 0  # keep track of number of cases submitted until end of function (or user closes progress window)       
+        n_workers = min(config.max_number_process, config.zip_max_pending)
+        pending_cases = []     # cases copied on file server, waiting to be inserted on database by batches
+
+        # create folder structure if not existing: "Cases/user/machine/case"
+        cases_folder_relative_to_server = pathlib.Path("Cases") / config.user_name.upper() / config.machine_name.upper()
+        cases_folder_absolute = str(self.server_path / cases_folder_relative_to_server)
+        os.makedirs(cases_folder_absolute, exist_ok = True)
+        cases_folder_posix = cases_folder_relative_to_server.as_posix()  # path name standardized on database
+
+        # zip archives are created in parallel (compression releases the GIL) while previous ones are copied,
+        # at most "zip_max_pending" archives being ready or in progress, kept in memory unless they are large
+        progress = ProgressCounter(self.event_queue, 'submitting case {}/{}', len(cases_to_submit))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_workers) as executor:
+            zipping = collections.deque()
+            cases = iter(cases_to_submit)
+            while True:
+                for gui_case, case_files in cases:
+                    zip_file = tempfile.SpooledTemporaryFile(max_size=config.zip_memory_size)
+                    origin_path = os.path.normpath(case_files[0]).replace(os.sep, '/')
+                    zipping.append((gui_case, origin_path, zip_file,
+                                    executor.submit(zip_case_files, case_files, zip_file, keep_running)))
+                    if len(zipping) >= config.zip_max_pending:
+                        break
+                if not zipping or not keep_running:
+                    break
+
+                gui_case, origin_path, zip_file, zip_future = zipping.popleft()
+                progress.step()
+                with zip_file:
+                    zip_future.result()
+
+                    if not keep_running:
+                        break
+
+                    # copy case on file server with a unique name
+                    case_name = str(bson.ObjectId())
+                    zip_file.seek(0)
+                    with open(os.path.join(cases_folder_absolute, case_name), 'wb') as server_file:
+                        shutil.copyfileobj(zip_file, server_file, length=config.network_buffer_size)
+
+                if not keep_running:
+                    break
+
+                # add case on database
+                now = datetime.datetime.now()
+                db_case = {"user_group" : self.settings['user group'],
+                        "instance" : self.settings['instance'],
+                        "status" : "to process",
+                        "application": application,
+                        "origin" : {"machine" : config.machine_name, "user" : config.user_name,
+                                   'path':origin_path,
+                                   'time':{'start':now, 'end':no_date}},
+                        "processors" : {'processor_list':[],
+                                       "time":{'start':now, 'end':no_date}},
+                        'last_heartbeat' : no_date,
+                        'path' : '{}/{}'.format(cases_folder_posix, case_name)}
+                pending_cases.append((gui_case, db_case))
+                if len(pending_cases) >= config.db_insert_batch_size:
+                    n_cases_submitted += self.insert_cases(pending_cases)
+
+            # cases already copied on file server are added even if user stopped submission
+            n_cases_submitted += self.insert_cases(pending_cases)
+            for *_, zip_future in zipping:  # archives not submitted anymore
+                zip_future.cancel()
+        for *_, zip_file, _ in zipping:  # archives still being written have finished when leaving executor
+            zip_file.close()
+
+        self.event_queue.put({'type':'close progress'})
+        self.event_queue.put({'type':'info', 'message box':True,
+                                    'message':'1 case has been submitted successfully' if n_cases_submitted == 1
+                                    else '{} cases have been submitted successfully'.format(n_cases_submitted)})
+
+    def insert_cases(self, cases):
+        '''Insert cases on database in a single request and show them as submitted.
+
+        Args:
+            cases: List of cases to insert, each defined as a tuple of its gui id and its database document.
+                 The list is emptied.
+
+        Returns:
+            int: number of cases inserted.'''
+
+        n_cases = len(cases)
+        if n_cases:
+            self.mongodb.cases.insert_many([db_case for _, db_case in cases], ordered=False)
+            db_case = cases[0][1]  # cases are from a single submission
+            notify_case_event(self.case_events, 'to process', self.settings, db_case['application'],
+                              db_case['origin']['user'], db_case['origin']['machine'])
+            for gui_case, _ in cases:
+                self.event_queue.put({'type':'submitted case', 'case':gui_case})  # update gui
+            cases.clear()
+        return n_cases
+
+    def add_cases(self, files_selected, application, keep_running = True):
+        '''Add a list of cases to interface from files selected by user.
+        
+        A file selected can correspond to one or several cases to run. Each case being a list of input files.
+        Those cases are sent to the interface which displays the first input file of each case.
+        The application specific "send.py" function is used on each file selected.
+        
+        Args:
+            files_selected: Files selected by user
+            application: Application associated to input files
+            keep_running: Argument that can be associated to the state of a variable.
+                        When this variable is False, function ends.
+                        It is used to catch when user closes the progress window.'''
+
+        try:
+            send_module = return_module(application, self.applications_with_send()[application])  # return app-specific send module
+        except:
+            self.event_queue.put({'type':'close progress'})
+            self.event_queue.put({'type':'error',
+                                 'message':'Error while importing "{}" send module'.format(application)})
+            return
+        n_files = len(files_selected)
+        gui_cases = []       # cases sent at once to interface, with their displayed name
+        error_message = None
+        progress = ProgressCounter(self.event_queue, 'getting cases from file {}/{}', n_files)
+        for file_selected in files_selected:
+            if not keep_running:
+                break
+            progress.step()
+            try:
+                new_cases = send_module.select_input_files(file_selected)
+            except:
+                error_message = 'Error while executing "select_input_files" from "{}" send module'.format(application)
+                break
+            if type(new_cases) == type('') or not len(new_cases) or type(new_cases[0]) == type(''): # check return a list of cases (list of list of files)
+                error_message = '"select_input_files" from "{}" send module did not return a list of cases (each of these cases must be defined as a list of files)'.format(application)
+                break
+            gui_cases.extend((str(pathlib.Path(new_case[0])), new_case)  # display first file with OS-specific path representation
+                             for new_case in new_cases)
+
+        if gui_cases:
+            self.event_queue.put({'type':'add cases', 'cases':gui_cases})
+        self.event_queue.put({'type':'close progress'})
+        if error_message:
+            self.event_queue.put({'type':'error', 'message':error_message})
+        else:
+            self.event_queue.put({'type':'log_file_only', 'message':'Added cases to interface'})
+
+    def refresh_my_cases(self, keep_running = True):
+        '''Refresh "my cases" list.
+        
+        Access mongo database to display all user cases that have not been totally processed yet (ie not received by user).
+
+        Args:
+            keep_running: Argument that can be associated to the state of a variable.
+                        When this variable is False, function ends.
+                        It is used to catch when user closes the progress window.'''
+
+        total_to_process, total_to_receive = 0, 0
+        my_cases = []      # cases sent at once to interface
+        complete = True    # False if refresh was interrupted
+        instance_filter = {"user_group":self.settings['user group'], 'instance':self.settings['instance']}
+        cases = list(self.mongodb.cases.find(filter = dict(instance_filter,
+            **{"status":{"$in":['to process', 'processing', 'processed']},
+               'origin.user':config.user_name, 'origin.machine':config.machine_name}),
+            projection=['status', 'application', 'origin.path', 'processors.processor_list'],
+            sort= [("_id",pymongo.ASCENDING)], batch_size=config.db_batch_size))
+
+        # position in wait list is given by cases to process submitted before, only read from index when it exists
+        waiting = [case['_id'] for case in cases if case['status'] == 'to process']
+        waiting_ids = []
+        if waiting:
+            waiting_ids = [case['_id'] for case in self.mongodb.cases.find(
+                filter = dict(instance_filter, status='to process', _id={'$lte':waiting[-1]}),
+                projection={'_id':1}, sort= [("_id",pymongo.ASCENDING)],
+                batch_size=config.db_batch_size)]
+
+        for case in cases:
+            if not keep_running:
+                complete = False
+                break
+            if case['status'] == 'processed':
+                total_to_receive += 1
+            else:
+                total_to_process += 1
+            processor = '' if not case['processors']['processor_list'] else case['processors']['processor_list'][-1]['user']  # get latest processor (in case it failed)
+            status = case['status'] if case['status'] != 'to process' else 'wait #{}'.format(
+                bisect.bisect_right(waiting_ids, case['_id']))  # set to position in wait list
+            my_cases.append({'id':str(case['_id']), 'case':str(pathlib.Path(case['origin']['path'])),
+                             'application':case['application'], 'processor': processor, 'status':status})
+        self.event_queue.put({'type':'update my cases', 'cases to process': total_to_process, 'cases to receive': total_to_receive,
+                             'cases':my_cases, 'complete':complete})
+        self.event_queue.put({'type':'close progress'})
+        self.event_queue.put({'type':'log_file_only', 'message':'Refreshed "my cases" tab'})
+    
+    def create_report(self, file_report, keep_running = True):
+        '''Create a report of cases present on database.
+
+        Display cases and their details from database, limited to the ones from same "user group".
+
+        Args:
+            keep_running: Argument that can be associated to the state of a variable.
+                        When this variable is False, function ends.
+                        It is used to catch when user closes the progress window.'''
+
+        user_filter = {'user_group':self.settings['user group']}
+        number_cases = self.mongodb.cases.count_documents(user_filter)
+        self.event_queue.put({'type':'change progress max', 'progress maximum':number_cases})
+
+        # Headers
+        columns = ['Server Instance', 'Application', 'Current Path', 'Last signal to server',
+                'User Origin', 'Machine Origin', 'Path Origin', 'Current status',
+                'Time submitted by originator', 'Time started to process',
+                'Time finished to process', 'Time received by originator',
+                'Number of attempts to process', 'Processor User 1', 'Processor Machine 1',
+                'Processor User 2', 'Processor Machine 2', 'Processor User 3', 'Processor Machine 3']
+
+        with open(file_report, mode='w', encoding='utf8', newline='', buffering=config.file_buffer_size) as f:
+            f.write('Status of {}{}'.format(self.settings['user group'], os.linesep * 3))
+            writer = csv.writer(f, delimiter='\t', lineterminator=os.linesep)  # platform line endings as before
+            writer.writerow(columns)
+
+            # only needed fields are sent by database, with dates not set yet replaced by empty strings
+            def blank_default(field):
+                return {'$cond':[{'$eq':[field, no_date]}, '', field]}
+            cases = self.mongodb.cases.aggregate([
+                {'$match':user_filter},
+                {'$sort':{'_id':pymongo.ASCENDING}},
+                {'$project':{'_id':0, 'instance':1, 'application':1, 'path':1,
+                             'last_heartbeat':blank_default('$last_heartbeat'),
+                             'user':'$origin.user', 'machine':'$origin.machine', 'origin_path':'$origin.path',
+                             'status':1, 'submitted':'$origin.time.start',
+                             'started':blank_default('$processors.time.start'),
+                             'finished':blank_default('$processors.time.end'),
+                             'received':blank_default('$origin.time.end'),
+                             'attempts':{'$size':'$processors.processor_list'},
+                             'processors':{'$slice':['$processors.processor_list', 3]}}}],
+                batchSize=config.db_batch_size, allowDiskUse=True)
+
+            progress = ProgressCounter(self.event_queue, 'downloading case {}/{}', number_cases)
+            for case in cases:
+                if not keep_running:
+                    break
+
+                progress.step()
+                row = [case['instance'], case['application'], case['path'], case['last_heartbeat'],
+                       case['user'], case['machine'], case['origin_path'], case['status'], case['submitted'],
+                       case['started'], case['finished'], case['received'], case['attempts']]
+                for processor in case['processors']:
+                    row.extend((processor['user'], processor['machine']))
+                row.extend([''] * (len(columns) - len(row)))
+                writer.writerow(row)
+
+        self.event_queue.put({'type':'close progress'})
+        self.event_queue.put({'type':'info', 'message':'Created report from database in {}'.format(str(pathlib.Path(file_report))), 'message box':True})
+
+    def exit_processes(self):
+        '''Terminate program.
+        
+        Ensure daemon process (and its child processes) and daemon receive terminate properly.'''
+
+        self.exit_program.set()  # This value is scanned by daemons to know when to exit
+        for p in multiprocessing.active_children():
+            p.join()
+        if self.receive_thread is not None:
+            self.receive_thread.join()  # let a case being received finish before its connection is closed
+        self.mongo_client.close()
+        try:
+            os.remove(str(config.pid_file))
+        except OSError:
+            pass
+        self.event_queue.put({'type':'exit'})
+
+class ProgressCounter:
+    '''Count the steps of a long operation and notify them to the gui at most every "gui_progress_interval".
+
+    Steps started within the interval are notified in a single event, so that fast operations do not
+    send one event per step while slow ones are still displayed as soon as they start.
+
+    Args:
+        event_queue: queue of events to process by gui
+        label: text of progress window, formatted with number of current step and total number of steps
+        total: total number of steps
+        count: number of steps started
+        count_notified: number of steps already notified to gui
+        time_notified: time of last notification'''
+
+    def __init__(self, event_queue, label, total):
+
+        self.event_queue = event_queue
+        self.label = label
+        self.total = total
+        self.count = 0
+        self.count_notified = 0
+        self.time_notified = float('-inf')  # first step is notified immediately
+
+    def step(self):
+        '''Start next step.'''
+
+        self.count += 1
+        now = time.monotonic()
+        if now - self.time_notified >= config.gui_progress_interval:
+            self.event_queue.put({'type':'change progress', 'progress increment':self.count - self.count_notified,
+                                  'progress label':self.label.format(self.count, self.total)})
+            self.count_notified, self.time_notified = self.count, now
+
+class CaseEvents:
+    '''Wait for changes of status of cases, notified by other machines on the "case_events" capped collection.
+
+    Daemons keep a tailable cursor open on the collection, so that database sends new events as soon as
+    they are inserted instead of being polled for new cases. Events that do not concern the daemon are
+    ignored. When the collection cannot be used, waiting is a simple pause.
+
+    Args:
+        collection: "case_events" collection, None if not available
+        event_filter: fields that an event must have to be accepted, a set of accepted values or a single value
+        cursor: tailable cursor on the collection, None until opened'''
+
+    def __init__(self, collection, event_filter):
+
+        self.collection = collection
+        self.event_filter = event_filter
+        self.cursor = None
+
+    def open_cursor(self):
+        '''Open the tailable cursor and skip events already present in the collection.'''
+
+        self.cursor = self.collection.find(cursor_type=pymongo.CursorType.TAILABLE_AWAIT).max_await_time_ms(
+            int(config.daemon_pause * 1000))
+        for event in self.cursor:  # stops when reaching end of collection
+            pass
+
+    def accept(self, event):
+        '''Return True if the event concerns the daemon.'''
+
+        for key, accepted in self.event_filter.items():
+            value = event.get(key)
+            if not (value in accepted if isinstance(accepted, (set, frozenset)) else value == accepted):
+                return False
+        return True
+
+    def wait(self, exit_program, timeout):
+        '''Wait until an event concerning the daemon is received.
+
+        Args:
+            exit_program: variable scanned by daemons to know when to exit.
+            timeout: maximal time to wait in seconds.
+
+        Returns:
+            bool: True if an event was received, False if timeout expired or program exits.'''
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or exit_program.is_set():
+                return False
+            if self.collection is None:
+                exit_program.wait(remaining)  # returns as soon as program exits
+                continue
+            try:
+                if self.cursor is None or not self.cursor.alive:
+                    self.open_cursor()
+                event = next(self.cursor, None)  # database waits up to "daemon_pause" for a new event
+                if event is None and not self.cursor.alive:  # cursor closed by database, reopened after a pause
+                    exit_program.wait(min(remaining, config.daemon_pause))
+            except pymongo.errors.PyMongoError:
+                self.cursor, event = None, None
+                exit_program.wait(min(remaining, config.daemon_pause))
+            if event is not None and self.accept(event):
+                return True
+
+def open_case_events(mongodb):
+    '''Return the "case_events" capped collection, creating it if needed.
+
+    Args:
+        mongodb: connection to mongo database.
+
+    Returns:
+        Collection: "case_events" collection, None if it is not a capped collection or cannot be accessed.'''
+
+    try:
+        options = mongodb.case_events.options()
+        if not options:
+            create_case_events(mongodb)
+        elif not options.get('capped'):
+            return None
+    except pymongo.errors.CollectionInvalid:
+        pass  # created at the same time by another machine
+    except pymongo.errors.PyMongoError:
+        return None
+    return mongodb.case_events
+
+def create_case_events(mongodb):
+    '''Create the "case_events" capped collection.
+
+    A first event is inserted since a tailable cursor cannot stay open on an empty collection.
+
+    Args:
+        mongodb: connection to mongo database.'''
+
+    mongodb.create_collection('case_events', capped=True, size=config.db_case_events_size)
+    mongodb.case_events.insert_one({'kind':'created'})
+
+def notify_case_event(case_events, kind, settings, application, user, machine):
+    '''Notify daemons waiting on "case_events" that a case changed status.
+
+    Args:
+        case_events: "case_events" collection, None if not available.
+        kind: new status of the case, either "to process" or "processed".
+        settings: list of settings from settings.txt on file server.
+        application: application of the case.
+        user: user who submitted the case.
+        machine: machine from which the case was submitted.'''
+
+    if case_events is not None:
+        try:
+            case_events.insert_one({'kind':kind, 'user_group':settings['user group'], 'instance':settings['instance'],
+                                    'application':application, 'user':user, 'machine':machine})
+        except pymongo.errors.PyMongoError:
+            pass  # daemons still look for cases regularly
+
+def connect_mongodb(settings):
+    '''Return the client connected to mongo database of current process, keeping a pool of authenticated connections.
+
+    Clients cannot be shared between processes, so the client is created on first call in each process,
+    identified by its pid, and reused by next calls from same process.
+
+    Args:
+        settings: list of settings from settings.txt on file server
+
+    Returns:
+        pymongo.MongoClient: client connected to mongo server.'''
+
+    global process_client, process_client_pid
+
+    if process_client_pid != os.getpid():  # never reuse a client inherited from parent process
+        process_client = pymongo.MongoClient(settings['mongodb server'], username=settings['user group'],
+                               password=settings['password'], authSource='gridcompute',
+                               maxPoolSize=config.mongo_max_pool_size,
+                               minPoolSize=config.mongo_min_pool_size,
+                               maxIdleTimeMS=config.mongo_max_idle_ms,
+                               serverSelectionTimeoutMS=config.mongo_server_selection_timeout_ms,
+                               appname=config.program_name)
+        process_client_pid = os.getpid()
+    return process_client
+
+def zip_case_files(case_files, zip_file, keep_running = True):
+    '''Create the zip archive of the input files of a case.
+
+    Each input file or folder is stored in the archive with its position in the case added to its name.
+
+    Args:
+        case_files: List of input files associated to the case.
+        zip_file: File object receiving the zip archive, left open.
+        keep_running: Argument that can be associated to the state of a variable.
+                    When this variable is False, function ends.'''
+
+    with zipfile.ZipFile(zip_file, mode='w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=config.zip_compress_level) as zip_case:
+        for input_number, input_file in enumerate(case_files):
+            if not keep_running:
+                break
+            base = '{}_{}'.format(input_number, os.path.basename(os.path.normpath(input_file)))  # add position of file in its name
+            try:
+                mode = os.stat(input_file).st_mode                     # type of file read once
+            except OSError:
+                continue                                               # files not existing are ignored
+            if stat.S_ISREG(mode):                                     # if this is a file, we just write it
+                write_to_zip(zip_case, input_file, arcname = base)
+            elif stat.S_ISDIR(mode):                                   # if this is a folder, we write full structure
+                for root, dirs, files in os.walk(input_file):
+                    relative_root = os.path.relpath(root, input_file)
+                    archive_root = base if relative_root == os.curdir else '{}/{}'.format(
+                        base, relative_root.replace(os.sep, '/'))
+                    if not dirs and not files:                         # empty folders are written explicitly
+                        zip_case.writestr(zipfile.ZipInfo(archive_root + '/'), '')
+                    for name in files:
+                        write_to_zip(zip_case, os.path.join(root, name), arcname = '{}/{}'.format(archive_root, name))
+
+def write_to_zip(zip_case, file_path, arcname):
+    '''Write a file in a zip archive, reading it with a large buffer.
+
+    Files that are already compressed, identified by their extension or by a sample of their beginning that
+    does not compress, are stored without compression.
+
+    Args:
+        zip_case: zip archive opened for writing.
+        file_path: path of file to write.
+        arcname: name of file in archive.'''
+
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    with open(file_path, 'rb', buffering=config.file_buffer_size) as src:
+        sample = src.read(config.zip_sample_size)
+        if (os.path.splitext(file_path)[1].lower() in config.incompressible_extensions
+                or (len(sample) == config.zip_sample_size
+                    and len(zlib.compress(sample, 1)) > config.zip_incompressible_ratio * len(sample))):
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zip_case.compression
+            # level is set by ZipFile.write but not by ZipFile.open, attribute is only public from python 3.13
+            if hasattr(zinfo, 'compress_level'):
+                zinfo.compress_level = zip_case.compresslevel
+            else:
+                zinfo._compresslevel = zip_case.compresslevel
+        with zip_case.open(zinfo, 'w') as dst:
+            dst.write(sample)
+            shutil.copyfileobj(src, dst, length=config.file_buffer_size)
+
+def extract_case(zip_path, directory):
+    '''Extract a zip archive from file server, reading it by large chunks without copying it first.
+
+    Args:
+        zip_path: path of zip archive on file server.
+        directory: directory where files are extracted.'''
+
+    with open(zip_path, 'rb', buffering=config.network_buffer_size) as zip_file, zipfile.ZipFile(zip_file) as zip_case:
+        zip_case.extractall(directory)
+
+def restore_file_names(directory):
+    '''Rename files extracted from a case archive as originally, without their position indicator.
+
+    Args:
+        directory: directory where case archive was extracted.
+
+    Returns:
+        tuple: paths of files in the order they were sent to server.'''
+
+    list_files = []  # list containing tuple (position, original file name, extracted path)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            position, original_name = entry.name.split('_', 1)
+            list_files.append((int(position), original_name, entry.path))
+    list_files.sort()
+    original_files_sorted = []
+    for _, original_name, path in list_files:
+        original_file = os.path.join(directory, original_name)
+        os.rename(path, original_file)
+        original_files_sorted.append(original_file.replace(os.sep, '/'))
+    return tuple(original_files_sorted)
+
+def check_quit_program(exit_program):
+    '''Function used by daemons to check if they need to terminate and kill their child processes.
+    
+    Args:
+        exit_program: Variable scanned by daemons to know when to exit.'''
+    
+    if exit_program.is_set():
+        terminate_processes(multiprocessing.active_children())
+        raise SystemExit
+
+def terminate_processes(processes):
+    '''Terminate processes and wait for them to finish.
+
+    Processes still alive after "daemon_pause" seconds, like paused processes which cannot handle a
+    termination request, are killed.
+
+    Args:
+        processes: List of processes to terminate.'''
+
+    for p in processes:
+        p.terminate()
+    deadline = time.monotonic() + config.daemon_pause
+    for p in processes:
+        p.join(max(0, deadline - time.monotonic()))  # returns as soon as process finishes
+        if p.is_alive():
+            p.kill()
+            p.join()
+
+def refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, mongodb, paused_process):
+    '''Refresh status variables used by daemon process.
+    
+    Args:
+        alive_process: List of processes alive.
+        dedicated_process: Number of dedicated process selected in gui.
+        event_queue: Queue of events to process by gui.
+        exit_program: Variable scanned by daemons to know when to exit.
+        gui_answer: Notify when gui answered a question.
+        mongodb: Connection to mongo database.
+        paused_process: List of processes currently on pause.
+
+    Returns:
+        list: child processes alive, listed once so that daemon process does not need to check them again.
+    '''
+    
+    check_quit_program(exit_program)
+    children = multiprocessing.active_children()
+
+    # Notifies user if process need to be stopped when user select 0 process
+    if not dedicated_process.value and children:
+        gui_answer.clear()
+        event_queue.put({'type':'terminate process?'})
+        gui_answer.wait()
+        if not dedicated_process.value:            # user confirmed all processes need to terminate
+            children = multiprocessing.active_children()
+            if children:
+                event_queue.put({'type':'info', 'message':'Terminating every running process'})
+                terminate_processes(children)
+                children = []
+
+    # Update paused_process. Check that processes paused are actually not terminated
+    children_set = set(children)
+    paused_process[:] = [p for p in paused_process if p in children_set]
+
+    # Check whether running processes displayed in GUI have finished
+    now = datetime.datetime.now()
+    heartbeats = []  # heartbeats sent to mongodb in a single request
+    still_alive = []
+    for p in alive_process:
+        if p['process'].is_alive():
+            # send heartbeat to mongodb on each case if it has been long enough
+            if (now - p['last heartbeat']).total_seconds() > config.db_heartbeat_frequency:
+                heartbeats.append(pymongo.UpdateOne({'_id':p['_id']}, {'$set': {'last_heartbeat': now}}))
+                p['last heartbeat'] = now
+            still_alive.append(p)
+        else:
+            event_queue.put({'type':'remove my process', 'pid':p['process'].pid})
+    alive_process[:] = still_alive  # list is updated in place, as it is kept by daemon process
+    if heartbeats:
+        mongodb.cases.bulk_write(heartbeats, ordered=False)
+    return children
+
+def run_daemon_process(applications_with_process, dedicated_process, event_queue, exit_program, gui_answer, server_path, settings, software_allowed_to_run):
+    '''Run "daemon process" that launches new processes when possible.
+    
+    Daemon process runs continuously and check on database if processes are available to launch when user allows it.
+    
+    Args:
+        applications_with_process: dictionary of applications that have a process function
+        dedicated_process: number of dedicated process selected in gui
+        event_queue: queue of events to process by gui
+        exit_program: variable scanned by daemons to know when to exit
+        gui_answer: notify when gui answered a question
+        server_path: path of file server as defined in "server.txt" file
+        settings: list of settings from settings.txt on file server
+        software_allowed_to_run: set of applications that can run as defined in "Software_Per_Machine.csv"
+    '''
+
+    event_queue.put({'type':'log_file_only', 'message':'Starting daemon process'})
+    if not (len(software_allowed_to_run) * len(applications_with_process)):
+        # current machine will not be able to process any case
+        event_queue.put({'type':'info', 'message box':True, 'message':'Possible applications to perform calculations: None'})
+        return
+    possible_apps = list(software_allowed_to_run & set(applications_with_process.keys()))
+    possible_apps.sort()
+    event_queue.put({'type':'info', 'message':'Possible applications to perform calculations: {}'.format(possible_apps)})
+
+    # create new connection
+    mongodb = connect_mongodb(settings).gridcompute
+    try:  # ensure cases are claimed through indexes, nothing is done if they already exist
+        mongodb.cases.create_indexes(cases_indexes)
+    except pymongo.errors.PyMongoError:
+        event_queue.put({'type':'log_file_only', 'message':'Indexes of cases could not be created'})
+    case_events = CaseEvents(open_case_events(mongodb), {'kind':'to process', 'user_group':settings['user group'],
+                                                         'instance':settings['instance'], 'application':set(possible_apps)})
+
+    case_updates = multiprocessing.Queue()  # updates of cases sent by launched processes
+    last_access_no_case = no_date  # last time db was accessed and no case was present
+    paused_process = []  # keep track of all processes that have been paused
+    alive_process = []   # keep track of all processes that are alive
+
+    while True:
+        refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, mongodb, paused_process)
+        if case_events.wait(exit_program, config.daemon_pause):
+            last_access_no_case = no_date  # new cases were submitted
+        children = refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, mongodb, paused_process)
+        apply_case_updates(case_updates, event_queue, mongodb, case_events.collection, settings)
+
+        # some process might need to pause (if user decreased number of allowed processes)
+        if dedicated_process.value < (len(children) - len(paused_process)):
+
+            # get process that we can pause
+            paused_set = set(paused_process)
+            p_possible_new_pause = [p for p in children if p not in paused_set]
+
+            for p in p_possible_new_pause[:len(children) - len(paused_process) - dedicated_process.value]:
+                if not p.is_alive():
+                    continue
+                event_queue.put({'type':'info', 'message':'Pausing one process'})
+                try:
+                    psutil.Process(p.pid).suspend()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):  # process terminated unexpectedly
+                    continue
+                paused_process.append(p)
+                event_queue.put({'type':'change my process', 'pid':p.pid, 'status':'paused'})
+                event_queue.put({'type':'log_file_only', 'message':'Paused one process'})
+
+        # some process might need to be created or restart
+        elif dedicated_process.value > (len(children) - len(paused_process)):
+
+            # restart process
+            while paused_process and (dedicated_process.value > (len(children) - len(paused_process))):
+                event_queue.put({'type':'info', 'message':'Resuming a paused process'})
+                p = paused_process.pop()
+                if not p.is_alive():
+                    continue
+                try:
+                    psutil.Process(p.pid).resume()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):  # process terminated unexpectedly
+                    continue
+                event_queue.put({'type':'change my process', 'pid':p.pid, 'status':'processing'})
+                event_queue.put({'type':'log_file_only', 'message':'Resumed a paused process'})
+                  
+            # try to create new process (no more processses are suspended)
+            if dedicated_process.value > len(children):
+
+                # check it has been a long time enough since last check of database with nothing to process
+                if (datetime.datetime.now() - last_access_no_case).total_seconds() > config.db_connect_frequency:
+                    event_queue.put({'type':'log_file_only', 'message':'Trying to get new cases from database'})
+                    try_new_case = True  # we can try to get new case to process from database
+
+                    while try_new_case:
+                        children = refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, mongodb, paused_process)
+                        apply_case_updates(case_updates, event_queue, mongodb, case_events.collection, settings)  # cases finished while claiming new ones
+
+                        # get a case that has a too long last_heartbeat or a new case, in a single request
+                        # (returns original fields and not updated ones)
+                        now = datetime.datetime.now()
+                        limit_last_heartbeat = now - datetime.timedelta(seconds=config.db_heartbeat_dead)
+                        case_to_process = mongodb.cases.find_one_and_update(
+                                {"user_group":settings['user group'], 'instance':settings['instance'], "application":{"$in":possible_apps},
+                                 '$or':[{"status":"processing", 'last_heartbeat':{'$lt':limit_last_heartbeat}}, {"status":"to process"}]},
+                                {"$set":{'status': 'processing', 'last_heartbeat': now, 'processors.time.start': now},
+                                 '$push':{'processors.processor_list': {'machine': config.machine_name, 'user': config.user_name}}},
+                                projection= ['path', 'application', 'origin.user', 'origin.machine', 'processors.processor_list'],
+                                sort= [("_id", pymongo.ASCENDING)])
+
+                        children = refresh_status_daemon_process(alive_process, dedicated_process, event_queue, exit_program, gui_answer, mongodb, paused_process)
+
+                        if case_to_process is None:
+                            # there is currently no case to run, try later
+                            try_new_case = False
+                            last_access_no_case = now
+                            event_queue.put({'type':'log_file_only', 'message':'No cases are currently available on database'})
+
+                        else:
+                            # check that case has not failed to process already 3 times
+                            if len(case_to_process['processors']['processor_list']) >= 3:
+                                event_queue.put({'type':'info', 'message':'A case from database has failed too many times'})
+                                mongodb.cases.update_one({'_id':case_to_process['_id']},
+                                                         {'$set': {'status': 'error: case failed to process already 3 times', 'processors.time.end': now},
+                                                         '$pop': {'processors.processor_list':1}})  # remove current processor from list since operation is cancelled
+
+                            else:
+                                # launch the case
+                                new_process = multiprocessing.Process(target=launch_process, daemon = True,
+                                                                     args=(case_to_process, applications_with_process[case_to_process['application']],
+                                                                           case_updates, event_queue, server_path))
+                                new_process.start()
+                                children.append(new_process)
+
+                                # keep track of process for gui
+                                event_queue.put({'type':'add my process', 'pid':new_process.pid, 'start':now, 'application':case_to_process['application'],
+                                                'originator': case_to_process['origin']['user'], 'status':'processing'})
+                                alive_process.append({'_id':case_to_process['_id'], 'process':new_process, 'last heartbeat':now})
+                        
+                            try_new_case = dedicated_process.value > len(children)
+
+
+def apply_case_updates(case_updates, event_queue, mongodb, case_events, settings):
+    '''Apply on database the updates of cases sent by launched processes.
+
+    Updates received are sent in a single request. Input files of processed cases are removed only once
+    database is updated, so that a case is processed again if its update is lost. Updates that cannot be
+    applied are put back on the queue to be retried, so that the daemon keeps running.
+
+    Args:
+        case_updates: queue of updates of cases, each defined by a tuple of the case, the fields to set and
+                      the path of its input file to remove (None to keep it).
+        event_queue: queue of events to process by gui.
+        mongodb: connection to mongo database.
+        case_events: "case_events" collection, None if not available.
+        settings: list of settings from settings.txt on file server.'''
+
+    updates = []
+    while True:
+        try:
+            updates.append(case_updates.get_nowait())
+        except queue.Empty:
+            break
+    if not updates:
+        return
+    try:
+        mongodb.cases.bulk_write([pymongo.UpdateOne({'_id':case['_id']}, {'$set':fields}) for case, fields, _ in updates],
+                                 ordered=False)
+    except pymongo.errors.PyMongoError:
+        event_queue.put({'type':'log_file_only', 'message':'Updates of {} cases could not be applied on database, retrying later'.format(len(updates))})
+        for update in updates:
+            case_updates.put(update)
+        return
+    for case, fields, input_path in updates:
+        if input_path is not None:
+            try:
+                os.remove(input_path)
+            except OSError:
+                event_queue.put({'type':'log_file_only', 'message':'Input file of case {} could not be removed from {}'.format(case['_id'], input_path)})
+        if fields['status'] == 'processed':
+            notify_case_event(case_events, 'processed', settings, case['application'],
+                              case['origin']['user'], case['origin']['machine'])
+
+def launch_process(case, process_script, case_updates, event_queue, server_path):
+    '''Launch one process from database.
+
+    When process finishes, the update of the case is sent to daemon process which applies it on mongo
+    database, so that no connection to database is created for each case.
+    
+    Args:
+        case: case to process obtained from mongo database.
+        process_script: path of app-specific process script.
+        case_updates: queue of updates of cases to apply on database by daemon process.
+        event_queue: queue of events to process by gui.
+        server_path: path of file server as defined in "server.txt" file.
+    '''
+
+    event_queue.put({'type':'log_file_only', 'message':'Launching case {}'.format(case['_id'])})
+    case_server_path_absolute = server_path / case['path']
+    if not case_server_path_absolute.is_file():
+        if server_path.is_dir():  # check that server is still accessible
+            # mark file as not existing
+            case_updates.put((case, {'status': 'error: file input not found', 'processors.time.end': datetime.datetime.now()}, None))
+            event_queue.put({'type':'info', 'message':'Error: File input for case {} not found at {}'.format(case['_id'], case['path'])})
+        else:
+            event_queue.put({'type':'critical', 'message':'Server not accessible at {}'.format(server_path)})
+            raise SystemExit
+    else:
+        # Prepare temporary folder to run the case
+        with tempfile.TemporaryDirectory() as temp_directory:
+            event_queue.put({'type':'log_file_only', 'message':'Launching case {} in {}'.format(case['_id'], temp_directory)})
+            extract_case(str(case_server_path_absolute), temp_directory)
+
+            # rename files as originally and list them as they were sent to server
+            original_files_sorted = restore_file_names(temp_directory)
+
+            # Load module for processing the case
+            try:
+                process_module = return_module(case['application'], process_script)
+            except:
+                event_queue.put({'type':'error', 'message':'Error while importing "{}" process module\nProcess daemon exiting'.format(case['application'])})
+                return
+            
+            # Process and return output files
+            try:
+                output_files = process_module.process_case(original_files_sorted)
+            except:
+                event_queue.put({'type':'error', 'message':'Error while executing "process_case" from "{}" process module'.format(case['application'])})
+                return
+
+            # create folder structure if not existing: "Cases/user/machine/case"
+            results_folder_relative_to_server = pathlib.Path('Results') / case['origin']['user'].upper() / case['origin']['machine'].upper()
+            results_folder_absolute = server_path / results_folder_relative_to_server
+            os.makedirs(str(results_folder_absolute), exist_ok = True)
+
+            # zip all output files directly on file server, using unique identifier of case
+            result_path_relative_to_folder = results_folder_relative_to_server / pathlib.Path(case['path']).name
+            result_path_absolute = server_path / result_path_relative_to_folder
+            with open(str(result_path_absolute), 'wb', buffering=config.network_buffer_size) as zip_output:
+                zip_case_files(output_files, zip_output)
+
+        # mark case on database as processed, then remove case from cases folder
+        case_updates.put((case, {'status': 'processed', 'path': result_path_relative_to_folder.as_posix(), 'processors.time.end': datetime.datetime.now()},
+                          str(case_server_path_absolute)))
+
+    event_queue.put({'type':'log_file_only', 'message':'Processed case {}'.format(case['_id'])})
+
+def run_daemon_receive(applications_with_receive, event_queue, exit_program, server_path, settings):
+    '''Run "daemon receive" that retrieve back cases from server after they have been processed.
+    
+    Daemon receive runs continuously in a thread and check on database if output files are available.
+    
+    Args:
+        applications_with_receive: dictionary of applications that have a process function.
+        event_queue: queue of events to process by gui.
+        exit_program: variable scanned by daemons to know when to exit.
+        server_path: path of file server as defined in "server.txt" file.
+        settings: list of settings from settings.txt on file server.
+    '''
+
+    if not len(applications_with_receive):
+        event_queue.put({'type':'info', 'message box':True, 'message':'Possible applications to receive calculations: None'})
+        return
+    possible_apps = list(applications_with_receive.keys())
+    possible_apps.sort()
+    event_queue.put({'type':'info', 'message':'Possible applications to receive calculations: {}'.format(possible_apps)})
+
+    # create new connection
+    mongodb = connect_mongodb(settings).gridcompute
+    case_events = CaseEvents(open_case_events(mongodb), {'kind':'processed', 'user_group':settings['user group'],
+                                                         'instance':settings['instance'], 'application':set(possible_apps),
+                                                         'user':config.user_name, 'machine':config.machine_name})
+    
+    while not exit_program.is_set():
+        case_to_receive = mongodb.cases.find_one({
+            "user_group":settings['user group'], 'instance':settings['instance'], "status":"processed",
+            'origin.user':config.user_name, 'origin.machine':config.machine_name,
+            "application":{"$in":possible_apps}},
+            projection=['path', 'application', 'origin.user'])
+
+        if case_to_receive is None:
+            # there is currently no case to receive, wait until one is processed
+            case_events.wait(exit_program, config.db_connect_frequency)
+
+        elif not (server_path / case_to_receive['path']).is_file():
+            if server_path.is_dir():  # check that server is still accessible
+                mongodb.cases.update_one({'_id':case_to_receive['_id']}, {'$set': {'status': 'error: file output not found', 'processors.time.end': datetime.datetime.now()}})
+                event_queue.put({'type':'info', 'message':'Error: File onput for case {} not found at {}'.format(case_to_receive['_id'], case_to_receive['path'])})
+            else:
+                event_queue.put({'type':'critical', 'message':'Server not accessible at {}'.format(server_path)})
+                raise SystemExit
+        else:
+            event_queue.put({'type':'log_file_only', 'message':'Receiving case {}'.format(case_to_receive['_id'])})
+            event_queue.put({'type':'add my process', 'pid':os.getpid(), 'start':datetime.datetime.now(), 'application':case_to_receive['application'], 'originator': case_to_receive['origin']['user'], 'status':'receiving'})
+
+            case_to_receive_absolute = server_path / case_to_receive['path']
+            # Prepare temporary folder to receive the case
+            with tempfile.TemporaryDirectory() as temp_directory:
+                event_queue.put({'type':'log_file_only', 'message':'Processing request to receive case {} in {}'.format(case_to_receive['_id'], temp_directory)})
+                extract_case(str(case_to_receive_absolute), temp_directory)
+
+                # rename files as originally and list them as they were sent to server
+                original_files_sorted = restore_file_names(temp_directory)
+
+                # Load module for receiving the case
+                try:
+                    receive_module = return_module(case_to_receive['application'],
+                                                   applications_with_receive[case_to_receive['application']])
+                except:
+                    event_queue.put({'type':'error', 'message':'Error while importing "{}" receive module\nReceive daemon exiting'.format(case_to_receive['application'])})
+                    return
+
+                # Execute receive function
+                try:
+                    receive_module.receive_case(original_files_sorted)
+                except:
+                    event_queue.put({'type':'error', 'message':'Error while executing "receive_case" from "{}" receive module\nReceive daemon about to exit'.format(case_to_receive['application'])})
+                    return
+
+            # mark case on database as received
+            mongodb.cases.update_one({'_id':case_to_receive['_id']}, {'$set': {'status': 'received', 'path': '', 'origin.time.end': datetime.datetime.now()}})
+
+            # remove case from results folder
+            os.remove(str(case_to_receive_absolute))
+            
+            event_queue.put({'type':'log_file_only', 'message':'Received case {}'.format(case_to_receive['_id'])})
+            event_queue.put({'type':'remove my process', 'pid':os.getpid()})
+
+
+class ScriptLoader(importlib.machinery.SourceFileLoader):
+    '''Loader of app-specific scripts caching their bytecode in "bytecode_cache_folder".
+
+    Bytecode of other modules keeps its usual location, only scripts from file server are cached locally.
+    Cached bytecode is used as long as the script keeps the same modification time and size, and only
+    when the cache folder and file belong to current user, so that other users cannot have code executed.'''
+
+    def get_code(self, fullname):
+        '''Return the code object of the script, from local cache when it is up to date.'''
+
+        source_path = self.get_filename(fullname)
+        source_stat = os.stat(source_path)
+        header = importlib.util.MAGIC_NUMBER + struct.pack('<III', 0, int(source_stat.st_mtime) & 0xFFFFFFFF,
+                                                           source_stat.st_size & 0xFFFFFFFF)
+        cache_folder = private_cache_folder()
+        if cache_folder is None:  # script is executed without cache
+            return self.source_to_code(self.get_data(source_path), source_path)
+        cache_path = cache_folder / '{}.{}.pyc'.format(
+            fullname, hashlib.sha1(os.path.abspath(source_path).encode('utf8')).hexdigest()[:16])
+        try:
+            with cache_path.open(mode='rb') as f:
+                data = f.read() if is_private(os.fstat(f.fileno())) else b''
+            if data.startswith(header):
+                return marshal.loads(data[len(header):])
+        except (OSError, EOFError, ValueError, TypeError):  # not cached yet or unreadable cache
+            pass
+
+        code = self.source_to_code(self.get_data(source_path), source_path)
+        if not sys.dont_write_bytecode:
+            try:  # written in a temporary file first so that other processes never read a partial cache
+                temp_path = cache_path.with_name('{}.{}'.format(cache_path.name, os.getpid()))
+                temp_fd = os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+                with open(temp_fd, mode='wb') as f:
+                    f.write(header + marshal.dumps(code))
+                os.replace(str(temp_path), str(cache_path))
+            except OSError:  # script is still executed without cache
+                pass
+        return code
+
+def is_private(file_stat):
+    '''Return whether a file belongs to current user and cannot be modified by others.
+
+    Ownership is not checked where it is not available, like on Windows where temporary folder is per user.
+
+    Args:
+        file_stat: result of os.stat on the file.'''
+
+    if not hasattr(os, 'getuid'):
+        return True
+    return file_stat.st_uid == os.getuid() and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+def private_cache_folder():
+    '''Return the folder caching bytecode of app-specific scripts, creating it if needed.
+
+    Returns:
+        pathlib.Path: "bytecode_cache_folder", None if it cannot be created or is not private to current user.'''
+
+    folder = config.bytecode_cache_folder
+    try:
+        folder.mkdir(mode=0o700, parents=True, exist_ok=True)
+        folder_stat = os.lstat(str(folder))
+    except OSError:
+        return None
+    if not stat.S_ISDIR(folder_stat.st_mode) or not is_private(folder_stat):
+        return None
+    return folder
+
+def return_module(application, script_path):
+    '''Import app-specific script send, process or receive.
+
+    Script is loaded directly from its file and kept, so that it is executed only once per process.
+    Its bytecode is cached on local disk, so that new processes do not compile it again even when the
+    settings folder is read-only.
+
+    Args:
+        application: name of application.
+        script_path: path of the script on file server.
+
+    Returns:
+        module: module defined by the script.'''
+
+    script_path = str(script_path)
+    module = loaded_modules.get(script_path)
+    if module is None:
+        name = "{}.{}".format(application, os.path.splitext(os.path.basename(script_path))[0])
+        spec = importlib.util.spec_from_file_location(name, script_path, loader=ScriptLoader(name, script_path))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        loaded_modules[script_path] = module
+    return module
+
+
+if __name__ == "__main__":
+    event_queue = multiprocessing.Queue()
+    test_server = Server(event_queue)
@@ -71,6 +71,7 @@ def ensure_single_instance(current_pid, event_queue):
 if __name__ == "__main__":
 
     multiprocessing.freeze_support()  # allow freeze of program
+    multiprocessing.set_start_method('spawn')  # daemons start with a clean state, without inherited connections
 
     interface.init_log()   # Initialize logging in file
     gui = interface.GUI()  # Create gui with init screen
@@ -1,49 +1,69 @@
-'''This script is used for building the executuble with cx_Freeze.
- 
-Please refer to the section "Development" of the documentation for building the application.'''
-
-# Copyright 2014 Boris Dayma
-# 
-# This file is part of GridCompute.
-# 
-# GridCompute is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, version 3 of the License.
-# 
-# GridCompute is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-# 
-# You should have received a copy of the GNU General Public License
-# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
-#
-# For any question, please contact Boris Dayma at boris.dayma@gmail.com
-
-
-import sys
-from cx_Freeze import setup, Executable
-
-import g_config
-
-
-if __name__ == "__main__":
-
-    base = None
-    # TODO uncomment to hide console (+ refer to filed bug)
-    #if sys.platform == 'win32':
-    #    base = 'Win32GUI'
-
-    include_files = [('server_template.txt', 'server.txt'), ('licenses', 'licenses')]
-
-    name_executable = 'GridCompute.exe' if sys.platform == 'win32' else 'GridCompute'
-
-    setup(name=g_config.program_name,
-          version=g_config.version,
-          description='Quick implementation of Grid Computing',
-          author=g_config.author,
-          options = {'build_exe': {'include_files':include_files, 'include_msvcr': True, 'optimize':2}}, 
-          executables=[Executable('main.py', base=base, targetName=name_executable)]
-          )
-
-
+'''This script is used for building the executuble with cx_Freeze.
+ 
+Please refer to the section "Development" of the documentation for building the application.'''
+
+# Copyright 2014 Boris Dayma
+# 
+# This file is part of GridCompute.
+# 
+# GridCompute is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+# 
+# GridCompute is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For any question, please contact Boris Dayma at boris.dayma@gmail.com
+
+
+import ast
+import sys
+from cx_Freeze import setup, Executable
+
+
+def read_constants(path, names):
+    '''Read constants assigned to literals in a module without importing it.
+
+    Args:
+        path: Path of the python module.
+        names: Names of the constants to read.
+
+    Returns:
+        dict: Value of each constant found, by name.
+    '''
+
+    with open(path, encoding='utf8') as f:
+        tree = ast.parse(f.read(), path)
+    return {target.id: ast.literal_eval(node.value) for node in tree.body if isinstance(node, ast.Assign)
+            for target in node.targets if isinstance(target, ast.Name) and target.id in names}
+
+
+if __name__ == "__main__":
+
+    constants = read_constants('g_config.py', ('program_name', 'version', 'author'))
+
+    base = None
+    # TODO uncomment to hide console (+ refer to filed bug)
+    #if sys.platform == 'win32':
+    #    base = 'Win32GUI'
+
+    include_files = [('server_template.txt', 'server.txt'), ('licenses', 'licenses')]
+
+    name_executable = 'GridCompute.exe' if sys.platform == 'win32' else 'GridCompute'
+
+    setup(name=constants['program_name'],
+          version=constants['version'],
+          description='Quick implementation of Grid Computing',
+          author=constants['author'],
+          options = {'build_exe': {'include_files':include_files, 'include_msvcr': True, 'optimize':1,
+                                   'zip_include_packages':['*'],  # modules imported from library.zip at startup
+                                   'zip_exclude_packages':['bson', 'psutil', 'pymongo']}},  # packages with compiled extensions
+          executables=[Executable('main.py', base=base, targetName=name_executable)]
+          )
+
+
@@ -21,9 +21,24 @@
 
 # These modules are only required for below example
 import os.path
-import pathlib
-import getpass, platform
+import getpass, inspect, platform
 import random, time
+import shutil, subprocess
+
+# one thread per case since GridCompute already runs as many cases at once as dedicated processes
+os.environ.setdefault('NUMBA_NUM_THREADS', '1')  # read by numba import
+try:  # compile the example task to multi-threaded native code when numba is installed
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+pypy = shutil.which('pypy3')  # otherwise compute in a PyPy interpreter when it is installed
+try:  # otherwise compute by large vectorized chunks in numpy when it is installed
+    import numpy
+except ImportError:
+    numpy = None
+rng = random.Random()  # seeded once from system entropy when the script is loaded
+header = 'Processed with Random Counter by {0} on {1}:'.format(getpass.getuser(), platform.node())  # same for all cases
 
 
 def process_case(input_files):
@@ -40,31 +55,53 @@ def process_case(input_files):
         str list: An ordered list (or tuple) of output files to return to the server.
     """
 
-    # In this example, we will count down from a random number. The output will be a single file which
-    # contains file name, who processed the file, and results of program.
-    folder = pathlib.Path(input_files[0]).parent
-    output_file = pathlib.Path(folder) / 'output.txt'
+    # In this example, we will approximate pi with a random number of intervals. The output will be a single
+    # file which contains file name, who processed the file, and results of program.
+    output_file_path = os.path.join(os.path.dirname(input_files[0]), 'output.txt')
 
     # Create some CPU intensive task
     start=time.time()
-    random.seed()
-    n=random.randint(100000000,250000000)
-    countdown(n)
+    n=rng.randint(100000000,250000000)
+    pi = compute_pi(n)
     end=time.time()
     total = end - start
 
-    with output_file.open(mode='w', encoding='utf8') as f_output:
-        print('Processed with Random Counter by {0} on {1}:'.format(getpass.getuser(), platform.node()), file = f_output)
-        for input_file in input_files:
-            print('{0}'.format(pathlib.Path(input_file).name), file = f_output)
-        print('Counter set to {}, run time: {}'.format(n, total), file=f_output)
+    lines = [header]
+    lines.extend(os.path.basename(input_file) for input_file in input_files)
+    lines.append('Counter set to {}, pi computed as {}, run time: {}'.format(n, pi, total))
+    with open(output_file_path, mode='w', encoding='utf8') as f_output:
+        f_output.write('\n'.join(lines) + '\n')  # written at once
 
-    output_file_path = str(output_file)
     return (output_file_path,)   # generator of files to return as output files
 
 
-# This is an auxiliary function required only for this example
-def countdown(n):
-    while n>0:
-        n -=1
+# These are auxiliary functions required only for this example, integrating 4/(1+x^2) between 0 and 1
+def compute_pi_loop(n):
+    total = 0.0
+    for i in prange(n):  # iterations are split across threads by numba
+        x = (i + 0.5) / n
+        total += 4.0 / (1.0 + x * x)
+    return total / n
+
+def compute_pi_pypy(n):
+    source = 'prange = range\n' + inspect.getsource(compute_pi_loop) + 'print(repr(compute_pi_loop({})))'.format(int(n))
+    result = subprocess.run([pypy, '-c', source],
+                            check=True, stdout=subprocess.PIPE, universal_newlines=True)
+    return float(result.stdout)
+
+def compute_pi_by_chunks(n, chunk_size=1000000):
+    total = 0.0
+    for start in range(0, n, chunk_size):  # chunks keep memory bounded while each one runs in compiled ufuncs
+        x = (numpy.arange(start, min(start + chunk_size, n), dtype=numpy.float64) + 0.5) / n
+        total += float((4.0 / (1.0 + x * x)).sum())
+    return total / n
 
+if njit is not None:
+    compute_pi = njit(parallel=True, cache=True)(compute_pi_loop)
+    compute_pi(1)  # compile at import so that run time of cases does not include compilation
+elif pypy is not None:
+    compute_pi = compute_pi_pypy
+elif numpy is not None:
+    compute_pi = compute_pi_by_chunks
+else:
+    compute_pi = compute_pi_loop
@@ -1,50 +1,68 @@
-'''This script is used to receive cases that have been processed, ie to specify what we want to do with the output files returned from *process.py* script.'''
-
-# Copyright 2014 Boris Dayma
-# 
-# This file is part of GridCompute.
-# 
-# GridCompute is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, version 3 of the License.
-# 
-# GridCompute is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-# 
-# You should have received a copy of the GNU General Public License
-# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
-#
-# For any question, please contact Boris Dayma at boris.dayma@gmail.com
-
-
-# These modules are only required for below example
-import pathlib
-import os.path
-
-
-def receive_case(output_files):
-    """Receive a case from the grid.
-    
-    This function receives a case that has been processed on the grid. 
-    Process is executed in a temporary folder where all files are copied.
-    
-    Args:
-        output_files (str list): ordered list (or tuple) of output files path.
-
-    Returns:
-        None.
-    """
-
-    # In this example, we know that the output is a single file which contains file size of all inputs
-    # we will append (or create) the results to file 'gridcompute_output.txt' in home directory
-    
-    case_output_file = pathlib.Path(output_files[0])
-    with case_output_file.open(mode='r', encoding='utf8') as f:
-        data = f.read()
-    
-    general_output_file = pathlib.Path(os.path.expanduser('~')) / 'gridcompute_output.txt'
-    with general_output_file.open(mode='a') as f:
-        print(data, file = f)
-
+'''This script is used to receive cases that have been processed, ie to specify what we want to do with the output files returned from *process.py* script.'''
+
+# Copyright 2014 Boris Dayma
+# 
+# This file is part of GridCompute.
+# 
+# GridCompute is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+# 
+# GridCompute is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with GridCompute.  If not, see <http://www.gnu.org/licenses/>.
+#
+# For any question, please contact Boris Dayma at boris.dayma@gmail.com
+
+
+# These modules are only required for below example
+import pathlib
+import os.path
+import shutil
+
+
+def receive_case(output_files):
+    """Receive a case from the grid.
+    
+    This function receives a case that has been processed on the grid. 
+    Process is executed in a temporary folder where all files are copied.
+    
+    Args:
+        output_files (str list): ordered list (or tuple) of output files path.
+
+    Returns:
+        None.
+    """
+
+    # In this example, we know that the output is a single file which contains file size of all inputs
+    # we will append (or create) the results to file 'gridcompute_output.txt' in home directory
+    
+    case_output_file = pathlib.Path(output_files[0])
+    general_output_file = pathlib.Path(os.path.expanduser('~')) / 'gridcompute_output.txt'
+    # sendfile refuses files opened in append mode so we move to the end of file ourselves
+    output_fd = os.open(str(general_output_file), os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+    with case_output_file.open(mode='rb') as src, open(output_fd, mode='wb', buffering=0) as dst:
+        dst.seek(0, os.SEEK_END)
+        copy_file_content(src, dst)  # bytes are copied without decoding them
+        dst.write(b'\n')             # blank line between cases
+
+
+# These are auxiliary functions required only for this example
+def copy_file_content(src, dst):
+    offset, size = 0, os.fstat(src.fileno()).st_size
+    if hasattr(os, 'sendfile'):  # copy within the kernel without reading data in python
+        try:
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        except OSError:  # not supported for these files, remaining data is copied below
+            pass
+    src.seek(offset)
+    shutil.copyfileobj(src, dst, length=1<<20)
+